@@ -36,6 +36,7 @@ else:
     from .src.operators.bake_operator import BakingOperator, AdvancedBakeOperator, AlignBakeOperator
     from .src.operators.randomize_coating import RandomizeCoatingOperator
     from .src.constants import version, version_string
+    from .src.model.model_cache import model_cache
 
     bl_info = {
         "name": "Ekur",
@@ -81,6 +82,31 @@ else:
             default=False,
         )
 
+        use_geometry_cache: bpy.props.BoolProperty(
+            name="Cache Decoded Models",
+            description="Whether to store decoded model geometry in the data folder, so importing the same model again skips decoding it.",
+            default=False,
+        )
+
+        model_cache_budget: bpy.props.IntProperty(
+            name="Model Cache Budget (MB)",
+            description="How much memory parsed models are allowed to take up before the least recently used ones are unloaded. Repeat imports of cached models skip parsing entirely.",
+            default=512,
+            min=0,
+        )
+
+        use_parallel_decoding: bpy.props.BoolProperty(
+            name="Parallel Model Decoding",
+            description="Whether to decode models in separate processes before importing maps, levels and spartans, using all CPU cores.",
+            default=True,
+        )
+
+        validate_meshes: bpy.props.BoolProperty(
+            name="Validate Meshes",
+            description="Whether to validate every imported mesh and fix any invalid geometry. Slows down imports, only needed for debugging broken models.",
+            default=False,
+        )
+
         def draw(self, _context: Context | None):
             layout = self.layout
             if not dump_exists():
@@ -100,6 +126,13 @@ else:
             box.prop(self, "deploy_folder")
             box.prop(self, "dump_textures")
             box.prop(self, "is_campaign")
+            box.prop(self, "use_geometry_cache")
+            box.prop(self, "model_cache_budget")
+            box.prop(self, "use_parallel_decoding")
+            box.prop(self, "validate_meshes")
+            box.label(
+                text=f"Model Cache: {len(model_cache)} models, {model_cache.size // (1024 * 1024)} MB, {model_cache.hits} hits, {model_cache.misses} misses"
+            )
             box2 = layout.box()
             _ = box2.operator("ekur.downloadfiles")
             _ = box2.operator("ekur.dumpfiles")
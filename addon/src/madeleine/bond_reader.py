@@ -3,11 +3,12 @@
 import struct
 import logging
 
+from collections.abc import Callable
 from io import BufferedReader
 from typing import cast
 
-from .madeleine import BondValue
-from .uleb import uleb128_decode, sleb128_decode
+from .madeleine import BondValue, BondValueType
+from .uleb import Buffer, uleb128_decode, sleb128_decode
 from .bond_types import BondType
 
 __all__ = [
@@ -19,218 +20,363 @@ __all__ = [
     "read_wstring",
     "read_string",
     "read_value",
+    "read_projected_value",
     "read_field",
     "read_struct",
+    "read_projected_struct",
+    "skip_value",
     "get_base_struct",
+    "Projection",
 ]
 
+# Field ids to decode by struct, with the projection to apply to the value of each field.
+# None decodes the whole value. Projections of lists, sets and maps apply to their elements.
+Projection = dict[int, "Projection | None"]
 
-def type_and_id(data: BufferedReader) -> tuple[int, BondType]:
+_INT8 = struct.Struct("<b")
+_UINT16 = struct.Struct("<H")
+_FLOAT = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+
+# Bond types by the low 5 bits of a field or element header, None for unknown types
+_TYPES: list[BondType | None] = [
+    BondType(i) if i in BondType._value2member_map_ else None for i in range(32)
+]
+
+
+def _get_type(header: int) -> BondType:
+    bond_type = _TYPES[header & 0x1F]
+    if bond_type is None:
+        raise ValueError(f"{header & 0x1F} is not a valid BondType")
+    return bond_type
+
+
+def type_and_id(data: Buffer, offset: int) -> tuple[int, BondType, int]:
     """
     Gets the type and ID of a BondValue.
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the field header in the buffer.
 
     Returns:
-    - ID and BondType of the BondValue.
+    - ID and BondType of the BondValue, and the offset after the header.
     """
-    id_and_type = data.read(1)[0]
-    bond_type = BondType(id_and_type & 0x1F)
+    id_and_type = data[offset]
+    bond_type = _get_type(id_and_type)
     id = id_and_type >> 5
     if id == 6:
-        id = data.read(1)[0]
+        id = data[offset + 1]
+        return id, bond_type, offset + 2
     elif id == 7:
-        id = int.from_bytes(data.read(2), byteorder="little")
-    return id, bond_type
+        id = _UINT16.unpack_from(data, offset + 1)[0]
+        return cast(int, id), bond_type, offset + 3
+    return id, bond_type, offset + 1
 
 
-def get_type_count(data: BufferedReader) -> tuple[BondType, int]:
+def get_type_count(data: Buffer, offset: int) -> tuple[BondType, int, int]:
     """
     Gets the type and count of an enumerable (like a list or set)
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the enumerable header in the buffer.
 
     Returns:
-    - BondType and count of the BondValue.
+    - BondType and count of the BondValue, and the offset after the header.
     """
-    len_and_type = data.read(1)[0]
-    bond_type = BondType(len_and_type & 0x1F)
+    len_and_type = data[offset]
+    bond_type = _get_type(len_and_type)
     length = len_and_type >> 5
     if length == 0:
-        length = uleb128_decode(data)
-    else:
-        length -= 1
-    return bond_type, length
+        return bond_type, *uleb128_decode(data, offset + 1)
+    return bond_type, length - 1, offset + 1
 
 
-def read_blobs(data: BufferedReader, count: int) -> None:
+def read_blobs(offset: int, count: int) -> int:
     """
     Skips over a specified amount of bytes that may contain arbitrary data.
 
     Args:
-    - data: Reader to get the data from.
-    - count: Number of bytes to read.
+    - offset: Offset of the data.
+    - count: Number of bytes to skip.
+
+    Returns:
+    - Offset after the skipped bytes.
     """
-    _ = data.seek(count, 1)
+    return offset + count
 
 
-def read_list(data: BufferedReader, type: BondType) -> list[BondValue]:
+def read_list(
+    data: Buffer, offset: int, type: BondType, projection: Projection | None = None
+) -> tuple[list[BondValue], int]:
     """
     Reads a list of elements of specified type.
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the list in the buffer.
     - type: Type of the elements of the list.
+    - projection: Optional projection to apply to every element.
 
     Returns:
-    - List of read elements
+    - List of read elements, and the offset after the list.
     """
-    type, count = get_type_count(data)
+    type, count, offset = get_type_count(data, offset)
     values: list[BondValue] = []
     if type == BondType.List or type == BondType.Int8 or type == BondType.Uint8:
-        read_blobs(data, count)
+        offset = read_blobs(offset, count)
+    elif projection is not None:
+        for _ in range(count):
+            val, offset = read_projected_value(0, type, data, offset, projection)
+            values.append(val)
     else:
         for _ in range(count):
-            val = read_value(0, type, data)
+            val, offset = read_value(0, type, data, offset)
             values.append(val)
-    return values
+    return values, offset
 
 
-def read_map(data: BufferedReader) -> dict[BondValue, BondValue]:
+def read_map(
+    data: Buffer, offset: int, projection: Projection | None = None
+) -> tuple[dict[BondValue, BondValue], int]:
     """
     Reads a key-value pair map determining the type of both.
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the map in the buffer.
+    - projection: Optional projection to apply to every value.
 
     Returns:
-    - Dictionary of read elements.
+    - Dictionary of read elements, and the offset after the map.
     """
-    key_type = BondType(data.read(1)[0] & 0x1F)
-    value_type = BondType(data.read(1)[0] & 0x1F)
-    count = uleb128_decode(data)
+    key_type = _get_type(data[offset])
+    value_type = _get_type(data[offset + 1])
+    count, offset = uleb128_decode(data, offset + 2)
     values: dict[BondValue, BondValue] = {}
     for _ in range(count):
-        key = read_value(0, key_type, data)
-        value = read_value(0, value_type, data)
+        key, offset = read_value(0, key_type, data, offset)
+        value, offset = read_projected_value(0, value_type, data, offset, projection)
         values[key] = value
-    return values
+    return values, offset
 
 
-def read_wstring(data: BufferedReader) -> str:
+def read_wstring(data: Buffer, offset: int) -> tuple[str, int]:
     """
     Reads a wide (UTF-16) string determining its length (in characters).
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the string in the buffer.
 
     Returns:
-    - String read from the buffer
-    - Empty string if UnicodeDecodeError is encountered.
+    - String read from the buffer, or an empty string if UnicodeDecodeError is encountered.
+    - Offset after the string.
     """
-    length = uleb128_decode(data)
+    length, offset = uleb128_decode(data, offset)
+    end = offset + length * 2
     try:
-        dat = data.read(length * 2).decode("utf-16")
-        return dat
+        return str(data[offset:end], "utf-16"), end
     except UnicodeDecodeError:
         logging.error("UnicodeDecodeError while reading wstring!")
-        return ""
+        return "", end
 
 
-def read_string(data: BufferedReader) -> str:
+def read_string(data: Buffer, offset: int) -> tuple[str, int]:
     """
     Reads a UTF-8 string determining its length (in characters).
 
     Args:
-    - data: Reader to get the data from.
+    - data: Buffer to get the data from.
+    - offset: Offset of the string in the buffer.
 
     Returns:
-    - String read from the buffer
-    - Empty string if UnicodeDecodeError is encountered.
+    - String read from the buffer, or an empty string if UnicodeDecodeError is encountered.
+    - Offset after the string.
     """
-    length = uleb128_decode(data)
+    length, offset = uleb128_decode(data, offset)
+    end = offset + length
     try:
-        dat = data.read(length).decode("utf-8")
-        return dat
+        return str(data[offset:end], "utf-8"), end
     except UnicodeDecodeError:
         logging.error("UnicodeDecodeError while reading string!")
-        return ""
+        return "", end
+
+
+def _read_uint8(data: Buffer, offset: int) -> tuple[int, int]:
+    return data[offset], offset + 1
+
+
+def _read_int8(data: Buffer, offset: int) -> tuple[int, int]:
+    return cast(int, _INT8.unpack_from(data, offset)[0]), offset + 1
+
+
+def _read_bool(data: Buffer, offset: int) -> tuple[bool, int]:
+    return bool(data[offset]), offset + 1
+
+
+def _read_float(data: Buffer, offset: int) -> tuple[float, int]:
+    return cast(float, _FLOAT.unpack_from(data, offset)[0]), offset + 4
+
+
+def _read_double(data: Buffer, offset: int) -> tuple[float, int]:
+    return cast(float, _DOUBLE.unpack_from(data, offset)[0]), offset + 8
+
+
+def _read_list(data: Buffer, offset: int) -> tuple[list[BondValue], int]:
+    return read_list(data, offset, BondType.List)
+
+
+def read_value(id: int, type: BondType, data: Buffer, offset: int) -> tuple[BondValue, int]:
+    """
+    Reads a value by creating a new value and dispatching on its type.
+
+    Args:
+    - id: ID of value
+    - type: Type of value to be created
+    - data: Buffer to get the data from
+    - offset: Offset of the value in the buffer.
 
+    Returns:
+    - Newly created BondValue, and the offset after the value.
+    """
+    reader = _READERS.get(type)
+    if reader is None:  # Stop, StopBase and Unavailable have no value
+        return BondValue(id, type, None), offset
+    value, offset = reader(data, offset)
+    return BondValue(id, type, value), offset
 
-def read_value(id: int, type: BondType, data: BufferedReader) -> BondValue:
+
+def read_projected_value(
+    id: int, type: BondType, data: Buffer, offset: int, projection: Projection | None
+) -> tuple[BondValue, int]:
     """
-    Reads a value by creating a new value and matching by type.
+    Reads a value, only decoding the fields of the projection from the structs within it.
 
     Args:
     - id: ID of value
     - type: Type of value to be created
-    - data: Reader to get the data from
+    - data: Buffer to get the data from
+    - offset: Offset of the value in the buffer.
+    - projection: Projection to apply to the value, None decodes the whole value.
 
     Returns:
-    - Newly created BondValue.
+    - Newly created BondValue, and the offset after the value.
     """
-    val = BondValue(id, type, None)
+    if projection is None:
+        return read_value(id, type, data, offset)
     match type:
         case BondType.Struct:
-            val.value = read_struct(data)
-        case BondType.Int32 | BondType.Int64 | BondType.Int16:
-            val.value = sleb128_decode(data)
-        case BondType.Uint16 | BondType.Uint32 | BondType.Uint64:
-            val.value = uleb128_decode(data)
-        case BondType.Uint8:
-            val.value = data.read(1)[0]
-        case BondType.Int8:
-            val.value = cast(int, struct.unpack("b", data.read(1))[0])
-        case BondType.Bool:
-            val.value = bool(data.read(1)[0])
-        case BondType.Float:
-            val.value = cast(float, struct.unpack("f", data.read(4))[0])
-        case BondType.Double:
-            val.value = cast(float, struct.unpack("d", data.read(8))[0])
-        case BondType.Set | BondType.List:
-            val.value = read_list(data, type)
+            value, offset = read_struct(data, offset, projection)
+        case BondType.List | BondType.Set:
+            value, offset = read_list(data, offset, type, projection)
         case BondType.Map:
-            val.value = read_map(data)
-        case BondType.Wstring:
-            val.value = read_wstring(data)
-        case BondType.String:
-            val.value = read_string(data)
-        case BondType.Stop | BondType.StopBase | BondType.Unavailable:
-            ...
-    return val
+            value, offset = read_map(data, offset, projection)
+        case _:
+            return read_value(id, type, data, offset)
+    return BondValue(id, type, value), offset
 
 
-def read_field(data: BufferedReader) -> BondValue:
+def skip_value(type: BondType, data: Buffer, offset: int) -> int:
+    """
+    Skips over a value without decoding it. Structs are skipped using their length prefix.
+
+    Args:
+    - type: Type of the value.
+    - data: Buffer to get the data from.
+    - offset: Offset of the value in the buffer.
+
+    Returns:
+    - Offset after the value.
+    """
+    match type:
+        case BondType.Struct:
+            length, offset = uleb128_decode(data, offset)
+            return offset + length
+        case (
+            BondType.Int16
+            | BondType.Int32
+            | BondType.Int64
+            | BondType.Uint16
+            | BondType.Uint32
+            | BondType.Uint64
+        ):
+            while data[offset] & 0x80:
+                offset += 1
+            return offset + 1
+        case BondType.Uint8 | BondType.Int8 | BondType.Bool:
+            return offset + 1
+        case BondType.Float:
+            return offset + 4
+        case BondType.Double:
+            return offset + 8
+        case BondType.String:
+            length, offset = uleb128_decode(data, offset)
+            return offset + length
+        case BondType.Wstring:
+            length, offset = uleb128_decode(data, offset)
+            return offset + length * 2
+        case BondType.List | BondType.Set:
+            type, count, offset = get_type_count(data, offset)
+            match type:
+                case BondType.List | BondType.Int8 | BondType.Uint8 | BondType.Bool:
+                    return offset + count
+                case BondType.Float:
+                    return offset + count * 4
+                case BondType.Double:
+                    return offset + count * 8
+                case _:
+                    for _ in range(count):
+                        offset = skip_value(type, data, offset)
+                    return offset
+        case BondType.Map:
+            key_type = _get_type(data[offset])
+            value_type = _get_type(data[offset + 1])
+            count, offset = uleb128_decode(data, offset + 2)
+            for _ in range(count):
+                offset = skip_value(key_type, data, offset)
+                offset = skip_value(value_type, data, offset)
+            return offset
+        case _:
+            return offset
+
+
+def read_field(data: Buffer, offset: int) -> tuple[BondValue, int]:
     """
     Identifies the ID and type of a Bond value, reading it depending on its type.
 
     Args:
-    - data: Reader to get the data from
+    - data: Buffer to get the data from
+    - offset: Offset of the field in the buffer.
 
     Returns:
-    - Newly created BondValue.
+    - Newly created BondValue, and the offset after the field.
     """
-    id, type = type_and_id(data)
-    val = read_value(id, type, data)
-    return val
+    id, type, offset = type_and_id(data, offset)
+    return read_value(id, type, data, offset)
 
 
-def read_struct(data: BufferedReader) -> list[BondValue]:
+def read_struct(
+    data: Buffer, offset: int, projection: Projection | None = None
+) -> tuple[list[BondValue], int]:
     """
     Reads a 'struct' BondValue by getting its length and reading until encountering either a `Stop` or `StopBase` value.
 
     Args:
-    - data: Reader to get the data from
+    - data: Buffer to get the data from
+    - offset: Offset of the struct in the buffer.
+    - projection: Optional projection of the fields to read, see `read_projected_struct`.
 
     Returns:
-    - List of values read by struct.
+    - List of values read by struct, and the offset after the struct.
     """
-    _length = uleb128_decode(data)
+    if projection is not None:
+        return read_projected_struct(data, offset, projection)
+    _length, offset = uleb128_decode(data, offset)
     values: list[BondValue] = []
     while True:
-        val = read_field(data)
+        val, offset = read_field(data, offset)
         match val.type:
             case BondType.Stop:
                 break
@@ -238,17 +384,78 @@ def read_struct(data: BufferedReader) -> list[BondValue]:
                 pass
             case _:
                 values.append(val)
-    return values
+    return values, offset
+
+
+def read_projected_struct(
+    data: Buffer, offset: int, projection: Projection
+) -> tuple[list[BondValue], int]:
+    """
+    Reads the fields of a struct that are in the projection, skipping over every other field.
+    Once each field of the projection was read, the rest of the struct is skipped using its
+    length prefix, so only the first of repeated fields is read.
+
+    Args:
+    - data: Buffer to get the data from
+    - offset: Offset of the struct in the buffer.
+    - projection: Projection of the fields to read.
+
+    Returns:
+    - List of values read by struct, and the offset after the struct.
+    """
+    length, offset = uleb128_decode(data, offset)
+    end = offset + length
+    missing = set(projection)
+    values: list[BondValue] = []
+    while missing:
+        id, type, offset = type_and_id(data, offset)
+        if type == BondType.Stop:
+            return values, offset
+        elif type == BondType.StopBase:
+            continue
+        elif id in missing:
+            val, offset = read_projected_value(id, type, data, offset, projection[id])
+            values.append(val)
+            missing.discard(id)
+        else:
+            offset = skip_value(type, data, offset)
+    return values, end
 
 
-def get_base_struct(data: BufferedReader) -> BondValue:
+def get_base_struct(
+    data: BufferedReader | Buffer, projection: Projection | None = None
+) -> BondValue:
     """
-    Gets the base (id 0) struct from the reader.
+    Gets the base (id 0) struct from the reader or buffer. Readers are read to the end first,
+    so the whole struct is decoded from a single buffer.
 
     Args:
-    - data: Reader to get the data from
+    - data: Reader or buffer to get the data from
+    - projection: Optional projection of the fields to read, every field is read if None.
 
     Returns:
     - BondValue containing the resulting base struct.
     """
-    return BondValue(0, BondType.Struct, read_struct(data))
+    buffer = data if isinstance(data, bytes | bytearray | memoryview) else data.read()
+    return BondValue(0, BondType.Struct, read_struct(buffer, 0, projection)[0])
+
+
+_READERS: dict[BondType, Callable[[Buffer, int], tuple[BondValueType, int]]] = {
+    BondType.Struct: read_struct,
+    BondType.Int16: sleb128_decode,
+    BondType.Int32: sleb128_decode,
+    BondType.Int64: sleb128_decode,
+    BondType.Uint16: uleb128_decode,
+    BondType.Uint32: uleb128_decode,
+    BondType.Uint64: uleb128_decode,
+    BondType.Uint8: _read_uint8,
+    BondType.Int8: _read_int8,
+    BondType.Bool: _read_bool,
+    BondType.Float: _read_float,
+    BondType.Double: _read_double,
+    BondType.Set: _read_list,
+    BondType.List: _read_list,
+    BondType.Map: read_map,
+    BondType.Wstring: read_wstring,
+    BondType.String: read_string,
+}
@@ -0,0 +1,231 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import struct
+from collections.abc import Callable
+from typing import cast
+
+from .bond_types import BondType
+from .madeleine import BondValue
+from .uleb import sleb128_encode, uleb128_encode
+
+__all__ = [
+    "write_base_struct",
+    "write_field",
+    "write_list",
+    "write_map",
+    "write_string",
+    "write_struct",
+    "write_type_and_id",
+    "write_type_count",
+    "write_value",
+    "write_wstring",
+]
+
+_INT8 = struct.Struct("<b")
+_UINT16 = struct.Struct("<H")
+_FLOAT = struct.Struct("<f")
+_DOUBLE = struct.Struct("<d")
+
+
+def write_type_and_id(out: bytearray, id: int, type: BondType) -> None:
+    """
+    Writes the header of a field, the counterpart of `type_and_id`.
+
+    Args:
+    - out: Buffer to write the data to.
+    - id: ID of the field.
+    - type: BondType of the field.
+    """
+    if id < 6:
+        out.append((id << 5) | type)
+    elif id < 256:
+        out.append((6 << 5) | type)
+        out.append(id)
+    else:
+        out.append((7 << 5) | type)
+        out += _UINT16.pack(id)
+
+
+def write_type_count(out: bytearray, type: BondType, count: int) -> None:
+    """
+    Writes the header of an enumerable (like a list or set), the counterpart of `get_type_count`.
+
+    Args:
+    - out: Buffer to write the data to.
+    - type: BondType of the elements.
+    - count: Number of elements.
+    """
+    if count < 7:
+        out.append(((count + 1) << 5) | type)
+    else:
+        out.append(type)
+        uleb128_encode(out, count)
+
+
+def write_list(out: bytearray, values: list[BondValue], type: BondType = BondType.Struct) -> None:
+    """
+    Writes a list of elements. The element type is taken from the first element, so the given
+    type is only used for empty lists. Bytes are written as a blob, which `read_list` skips.
+
+    Args:
+    - out: Buffer to write the data to.
+    - values: Elements of the list, all of the same type.
+    - type: Type of the elements if the list is empty.
+
+    Raises:
+    - ValueError: If the elements are lists, which `read_list` would skip as a blob.
+    """
+    if values:
+        type = values[0].type
+    if type == BondType.List:
+        raise ValueError("Lists of lists cannot be written")
+    write_type_count(out, type, len(values))
+    for value in values:
+        write_value(out, value)
+
+
+def write_map(out: bytearray, values: dict[BondValue, BondValue]) -> None:
+    """
+    Writes a key-value pair map, taking the types of both from the first pair.
+    Empty maps are written with Int32 keys and Struct values.
+
+    Args:
+    - out: Buffer to write the data to.
+    - values: Pairs of the map.
+    """
+    key_type, value_type = BondType.Int32, BondType.Struct
+    for key, value in values.items():
+        key_type, value_type = key.type, value.type
+        break
+    out.append(key_type)
+    out.append(value_type)
+    uleb128_encode(out, len(values))
+    for key, value in values.items():
+        write_value(out, key)
+        write_value(out, value)
+
+
+def write_wstring(out: bytearray, value: str) -> None:
+    """
+    Writes a wide (UTF-16) string prefixed with its length (in characters).
+
+    Args:
+    - out: Buffer to write the data to.
+    - value: String to write.
+    """
+    encoded = value.encode("utf-16-le")
+    uleb128_encode(out, len(encoded) // 2)
+    out += encoded
+
+
+def write_string(out: bytearray, value: str) -> None:
+    """
+    Writes a UTF-8 string prefixed with its length (in bytes).
+
+    Args:
+    - out: Buffer to write the data to.
+    - value: String to write.
+    """
+    encoded = value.encode("utf-8")
+    uleb128_encode(out, len(encoded))
+    out += encoded
+
+
+def _write_uint8(out: bytearray, value: int) -> None:
+    out.append(value)
+
+
+def _write_int8(out: bytearray, value: int) -> None:
+    out += _INT8.pack(value)
+
+
+def _write_bool(out: bytearray, value: bool) -> None:
+    out.append(1 if value else 0)
+
+
+def _write_float(out: bytearray, value: float) -> None:
+    out += _FLOAT.pack(value)
+
+
+def _write_double(out: bytearray, value: float) -> None:
+    out += _DOUBLE.pack(value)
+
+
+def write_value(out: bytearray, value: BondValue) -> None:
+    """
+    Writes the data of a value by dispatching on its type, without a field header.
+
+    Args:
+    - out: Buffer to write the data to.
+    - value: Value to write.
+    """
+    writer = _WRITERS.get(value.type)
+    if writer is not None:  # Stop, StopBase and Unavailable have no value
+        writer(out, value.value)
+
+
+def write_field(out: bytearray, value: BondValue) -> None:
+    """
+    Writes a value as a field of a struct, prefixed with its ID and type.
+
+    Args:
+    - out: Buffer to write the data to.
+    - value: Value to write.
+    """
+    write_type_and_id(out, value.id, value.type)
+    write_value(out, value)
+
+
+def write_struct(out: bytearray, fields: list[BondValue]) -> None:
+    """
+    Writes a 'struct' BondValue prefixed with its length and followed by a `Stop` value.
+
+    Args:
+    - out: Buffer to write the data to.
+    - fields: Fields of the struct.
+    """
+    body = bytearray()
+    for field in fields:
+        write_field(body, field)
+    body.append(BondType.Stop)
+    uleb128_encode(out, len(body))
+    out += body
+
+
+def write_base_struct(value: BondValue) -> bytes:
+    """
+    Writes the base struct, the counterpart of `get_base_struct`.
+
+    Args:
+    - value: BondValue containing the base struct.
+
+    Returns:
+    - Encoded struct.
+    """
+    out = bytearray()
+    write_struct(out, value.get_elements())
+    return bytes(out)
+
+
+_WRITERS: dict[BondType, Callable[[bytearray, object], None]] = cast(
+    dict[BondType, Callable[[bytearray, object], None]],
+    {
+        BondType.Struct: write_struct,
+        BondType.Int16: sleb128_encode,
+        BondType.Int32: sleb128_encode,
+        BondType.Int64: sleb128_encode,
+        BondType.Uint16: uleb128_encode,
+        BondType.Uint32: uleb128_encode,
+        BondType.Uint64: uleb128_encode,
+        BondType.Uint8: _write_uint8,
+        BondType.Int8: _write_int8,
+        BondType.Bool: _write_bool,
+        BondType.Float: _write_float,
+        BondType.Double: _write_double,
+        BondType.Set: write_list,
+        BondType.List: write_list,
+        BondType.Map: write_map,
+        BondType.Wstring: write_wstring,
+        BondType.String: write_string,
+    },
+)
@@ -4,12 +4,21 @@ import logging
 import urllib.request
 import urllib.error
 
+from collections.abc import Iterator
 from typing import Self
-from io import BufferedReader, BytesIO
+from io import BufferedReader
 
-from .bond_types import ForgeObjectMode
+from .bond_types import BondType, ForgeObjectMode
 from .madeleine import BondValue
-from .bond_reader import get_base_struct
+from .bond_reader import (
+    Projection,
+    get_type_count,
+    read_projected_value,
+    read_struct,
+    skip_value,
+    type_and_id,
+)
+from .uleb import Buffer, uleb128_decode
 
 __all__ = [
     "ForgeLayer",
@@ -19,9 +28,45 @@ __all__ = [
     "ForgeFolderEntry",
     "ForgeLevel",
     "get_forge_map",
+    "get_forge_map_data",
+    "iter_forge_map",
+    "read_forge_map",
+    "MAP_PROJECTION",
 ]
 
 
+# Fields of the map that are read, everything else is skipped while decoding
+_OBJECT_PROJECTION: Projection = {
+    2: None,
+    3: None,
+    4: None,
+    5: None,
+    8: {0: {0: {13: None}}, 23: {0: {0: None}}, 24: None},
+}
+_ENTRY_PROJECTION: Projection = {2: None, 6: None, 8: None}
+_FOLDER_PROJECTION: Projection = {
+    0: None,
+    1: {0: None, 1: None, 2: None, 5: None, 6: None, 7: _ENTRY_PROJECTION, 8: None},
+    2: None,
+}
+_LAYER_PROJECTION: Projection = {1: None, 3: None, 4: None, 5: None, 6: None, 8: None, 10: None}
+_MATERIAL_PROJECTION: Projection = {
+    1: None,
+    3: _LAYER_PROJECTION,
+    4: _LAYER_PROJECTION,
+    5: _LAYER_PROJECTION,
+    6: _LAYER_PROJECTION,
+    8: None,
+    9: None,
+    10: None,
+}
+MAP_PROJECTION: Projection = {
+    3: _OBJECT_PROJECTION,
+    6: {0: _FOLDER_PROJECTION, 1: None},
+    8: _MATERIAL_PROJECTION,
+}
+
+
 class ForgeLayer:
     swatch: int = 0
     color: int = 0
@@ -48,16 +93,28 @@ class ForgeMat:
 
 
 class ForgeObject:
-    index: int = 0
-    global_id: int = 0
-    position: list[float] = [0.0, 0.0, 0.0]
-    rotation_up: list[float] = [0.0, 0.0, 0.0]
-    rotation_forward: list[float] = [0.0, 0.0, 0.0]
-    scale: list[float] = [1.0, 1.0, 1.0]
-    variant: int = 0
-    mode: ForgeObjectMode = ForgeObjectMode(2)
-    variant_index: int = 0
-    material_id: int = 0
+    index: int
+    global_id: int
+    position: list[float]
+    rotation_up: list[float]
+    rotation_forward: list[float]
+    scale: list[float]
+    variant: int
+    mode: ForgeObjectMode
+    variant_index: int
+    material_id: int
+
+    def __init__(self):
+        self.index = 0
+        self.global_id = 0
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation_up = [0.0, 0.0, 0.0]
+        self.rotation_forward = [0.0, 0.0, 0.0]
+        self.scale = [1.0, 1.0, 1.0]
+        self.variant = 0
+        self.mode = ForgeObjectMode(2)
+        self.variant_index = 0
+        self.material_id = 0
 
 
 class ForgeFolderEntry:
@@ -67,18 +124,33 @@ class ForgeFolderEntry:
 
 
 class ForgeFolder:
-    name: str = ""
-    id: int = 0
-    parent: int = 0
-    objects: list[ForgeFolderEntry] = []
-    subcategories: list[Self] = []
+    name: str
+    id: int
+    parent: int
+    objects: list[ForgeFolderEntry]
+    subcategories: list[Self]
+
+    def __init__(self):
+        self.name = ""
+        self.id = 0
+        self.parent = 0
+        self.objects = []
+        self.subcategories = []
 
 
 class ForgeLevel:
-    objects: list[ForgeObject] = []
-    categories: list[ForgeFolder] = []
-    materials: list[ForgeMat] = []
-    root_category: int = 0
+    objects: list[ForgeObject]
+    categories: list[ForgeFolder]
+    materials: list[ForgeMat]
+    root_category: int
+    object_folders: dict[int, tuple[int, str]]  # object index -> (folder id, name)
+
+    def __init__(self):
+        self.objects = []
+        self.categories = []
+        self.materials = []
+        self.root_category = 0
+        self.object_folders = {}
 
 
 def get_forge_item(item: BondValue) -> ForgeObject | None:
@@ -185,7 +257,22 @@ def get_objects(value: BondValue) -> ForgeFolderEntry:
     return object
 
 
-def get_category(value: BondValue) -> list[ForgeFolder]:
+def add_folder_entry(
+    object_folders: dict[int, tuple[int, str]], entry: ForgeFolderEntry, folder: ForgeFolder
+) -> None:
+    if entry.parent != folder.id:
+        return
+    name = entry.name
+    if name == "" and entry.index in object_folders:
+        name = object_folders[entry.index][1]
+    object_folders[entry.index] = (folder.id, name)
+
+
+def get_category(
+    value: BondValue, object_folders: dict[int, tuple[int, str]] | None = None
+) -> list[ForgeFolder]:
+    if object_folders is None:
+        object_folders = {}
     folders = value.get_by_id(0)
     forge_categories: list[ForgeFolder] = []
     if not folders:
@@ -226,6 +313,11 @@ def get_category(value: BondValue) -> list[ForgeFolder]:
                 root_folder.subcategories.append(subfolder)
             else:
                 root_folder.objects.append(get_objects(obj_sub))
+                add_folder_entry(object_folders, root_folder.objects[-1], root_folder)
+        for subfolder in root_folder.subcategories:
+            if subfolder.parent == root_folder.id:
+                for ob in subfolder.objects:
+                    add_folder_entry(object_folders, ob, subfolder)
         forge_categories.append(root_folder)
     return forge_categories
 
@@ -258,66 +350,148 @@ def read_layer(value: BondValue) -> ForgeLayer:
     return layer
 
 
-def read_forge_map(reader: BufferedReader) -> ForgeLevel:
+def read_material(mat: BondValue) -> ForgeMat:
+    material = ForgeMat()
+    layers = [mat.get_by_id(3), mat.get_by_id(4), mat.get_by_id(5), mat.get_by_id(6)]
+    for layer in layers:
+        if layer:
+            material.layers.append(read_layer(layer))
+    scratch_amount = mat.get_by_id(9)
+    if scratch_amount and type(scratch_amount.value) is float:
+        material.scratch_amount = scratch_amount.value
+    grime_amount = mat.get_by_id(10)
+    if grime_amount and type(grime_amount.value) is float:
+        material.grime_amount = grime_amount.value
+    grime = mat.get_by_id(8)
+    if grime and len(grime.get_elements()) > 0:
+        grime_id = grime.get_elements()[0]
+        if type(grime_id.value) is int:
+            material.grime = grime_id.value
+
+    id = mat.get_by_id(1)
+    if id and len(id.get_elements()) > 0:
+        id = id.get_elements()[0]
+        if type(id.value) is int:
+            material.name = id.value
+    return material
+
+
+def _iter_structs(
+    data: Buffer, offset: int, type: BondType, projection: Projection
+) -> Iterator[tuple[BondValue | None, int]]:
+    """
+    Decodes the struct elements of a list one at a time, yielding each with the offset after it.
+    Ends by yielding None with the offset after the list, which is also all that is yielded for
+    values that are not lists of structs.
+    """
+    if type == BondType.List or type == BondType.Set:
+        element_type, count, elements = get_type_count(data, offset)
+        if element_type == BondType.Struct:
+            for _ in range(count):
+                values, elements = read_struct(data, elements, projection)
+                yield BondValue(0, BondType.Struct, values), elements
+            yield None, elements
+            return
+    yield None, skip_value(type, data, offset)
+
+
+def iter_forge_map(
+    data: BufferedReader | Buffer, level: ForgeLevel | None = None
+) -> Iterator[ForgeObject | ForgeFolder | ForgeMat]:
+    """
+    Decodes a forge map one item at a time. The top level folders and materials are yielded
+    first, so the root folder and the folder of every object are known on the level once the
+    objects follow. Objects are yielded while the object list is decoded, so the decoded data of
+    each object can be freed right away.
+
+    Args:
+    - data: Reader or buffer of the map file.
+    - level: Optional level to store the root folder and the folder of every object on.
+
+    Returns:
+    - An iterator of the top level folders, materials and objects of the map.
+    """
+    if level is None:
+        level = ForgeLevel()
+    buffer = data if isinstance(data, bytes | bytearray | memoryview) else data.read()
+    if len(buffer) == 0:
+        return
+    _length, offset = uleb128_decode(buffer, 0)
+    read: set[int] = set()
+    objects: tuple[BondType, int] | None = None
+    while True:
+        id, bond_type, offset = type_and_id(buffer, offset)
+        if bond_type == BondType.Stop:
+            break
+        if bond_type == BondType.StopBase:
+            continue
+        if id in read or id not in MAP_PROJECTION:
+            offset = skip_value(bond_type, buffer, offset)
+            continue
+        read.add(id)
+        if id == 3:
+            # Objects are stored before the folders, come back to them once the folders are read
+            objects = (bond_type, offset)
+            offset = skip_value(bond_type, buffer, offset)
+        elif id == 8:
+            item_end = offset
+            for item, item_end in _iter_structs(buffer, offset, bond_type, _MATERIAL_PROJECTION):
+                if item:
+                    yield read_material(item)
+            offset = item_end
+        else:
+            folders, offset = read_projected_value(
+                id, bond_type, buffer, offset, MAP_PROJECTION[id]
+            )
+            yield from get_category(folders, level.object_folders)
+            root = folders.get_by_id(1)
+            if root and type(root.value) is int:
+                level.root_category = root.value
+    if objects is None:
+        return
+    bond_type, offset = objects
+    for idx, (item, _) in enumerate(_iter_structs(buffer, offset, bond_type, _OBJECT_PROJECTION)):
+        forge_object = get_forge_item(item) if item else None
+        if forge_object:
+            forge_object.index = idx
+            yield forge_object
+
+
+def read_forge_map(reader: BufferedReader | Buffer) -> ForgeLevel:
     level = ForgeLevel()
-    base_struct = get_base_struct(reader)
-    base = base_struct.get_by_id(3)
-    if base:
-        for idx, item in enumerate(base.get_elements()):
-            forge_object = get_forge_item(item)
-            if forge_object:
-                forge_object.index = idx
-                level.objects.append(forge_object)
-    folders = base_struct.get_by_id(6)
-    mats = base_struct.get_by_id(8)
-    if mats:
-        for mat in mats.get_elements():
-            material = ForgeMat()
-            layers = [mat.get_by_id(3), mat.get_by_id(4), mat.get_by_id(5), mat.get_by_id(6)]
-            for layer in layers:
-                if layer:
-                    material.layers.append(read_layer(layer))
-            scratch_amount = mat.get_by_id(9)
-            if scratch_amount and type(scratch_amount.value) is float:
-                material.scratch_amount = scratch_amount.value
-            grime_amount = mat.get_by_id(10)
-            if grime_amount and type(grime_amount.value) is float:
-                material.grime_amount = grime_amount.value
-            grime = mat.get_by_id(8)
-            if grime and len(grime.get_elements()) > 0:
-                grime_id = grime.get_elements()[0]
-                if type(grime_id.value) is int:
-                    material.grime = grime_id.value
-
-            id = mat.get_by_id(1)
-            if id and len(id.get_elements()) > 0:
-                id = id.get_elements()[0]
-                if type(id.value) is int:
-                    material.name = id.value
-
-            level.materials.append(material)
-
-    if folders:
-        level.categories = get_category(folders)
-
-        root = folders.get_by_id(1)
-        if root and type(root.value) is int:
-            level.root_category = root.value
+    for item in iter_forge_map(reader, level):
+        if isinstance(item, ForgeObject):
+            level.objects.append(item)
+        elif isinstance(item, ForgeFolder):
+            level.categories.append(item)
+        else:
+            level.materials.append(item)
     return level
 
 
-def get_forge_map(asset_id: str, version_id: str, file: str) -> ForgeLevel:
-    level = ForgeLevel()
+def get_forge_map_data(asset_id: str, version_id: str, file: str) -> bytes:
+    """
+    Gets the contents of a map file, either from disk or downloaded from Waypoint.
+
+    Args:
+    - asset_id: Asset ID of the map, if it is downloaded.
+    - version_id: Version ID of the map, if it is downloaded.
+    - file: Path of the map file, downloaded instead if empty.
+
+    Returns:
+    - Contents of the map file, empty if it could not be downloaded.
+    """
     url = f"https://blobs-infiniteugc.svc.halowaypoint.com/ugcstorage/map/{asset_id}/{version_id}/map.mvar"
     if file != "":
         with open(file, "rb") as f:
-            return read_forge_map(f)
+            return f.read()
     try:
         with urllib.request.urlopen(url) as response:  # pyright: ignore[reportAny]
-            response = response.read()  # pyright: ignore[reportAny]
-            level = read_forge_map(BytesIO(response))  # pyright: ignore[reportAny, reportArgumentType]
-
+            return response.read()  # pyright: ignore[reportAny]
     except urllib.error.HTTPError as e:
         logging.error(f"Failed to download forge map: {e.status}")
+    return b""
 
-    return level
+
+def get_forge_map(asset_id: str, version_id: str, file: str) -> ForgeLevel:
+    return read_forge_map(get_forge_map_data(asset_id, version_id, file))
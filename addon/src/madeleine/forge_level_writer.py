@@ -0,0 +1,224 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+from .bond_types import BondType
+from .bond_writer import write_base_struct
+from .forge_level_reader import (
+    ForgeFolder,
+    ForgeFolderEntry,
+    ForgeLayer,
+    ForgeLevel,
+    ForgeMat,
+    ForgeObject,
+)
+from .madeleine import BondValue
+
+__all__ = [
+    "get_category_struct",
+    "get_folder_entry_struct",
+    "get_layer_struct",
+    "get_level_struct",
+    "get_material_struct",
+    "get_object_struct",
+    "write_forge_map",
+]
+
+# Folders without an ID are read back as the root folder
+_ROOT_FOLDER_ID = 4294967295
+
+
+def _struct(id: int, fields: list[BondValue]) -> BondValue:
+    return BondValue(id, BondType.Struct, fields)
+
+
+def _list(id: int, elements: list[BondValue]) -> BondValue:
+    return BondValue(id, BondType.List, elements)
+
+
+def _vector(id: int, values: list[float]) -> BondValue:
+    return _struct(id, [BondValue(i, BondType.Float, value) for i, value in enumerate(values)])
+
+
+def get_object_struct(forge_object: ForgeObject) -> BondValue:
+    """
+    Creates the struct of an object, the counterpart of `get_forge_item`.
+
+    Args:
+    - forge_object: Object to create the struct of.
+
+    Returns:
+    - Struct of the object, with the fields read by `get_forge_item`.
+    """
+    material = _struct(
+        0,
+        [
+            _struct(
+                0,
+                [_list(13, [BondValue(0, BondType.Uint32, forge_object.material_id)])],
+            )
+        ],
+    )
+    scale = _struct(23, [_struct(0, [_vector(0, forge_object.scale)])])
+    variant = _list(
+        24,
+        [
+            _struct(
+                0,
+                [
+                    BondValue(0, BondType.Int32, int(forge_object.mode)),
+                    _struct(1, [BondValue(0, BondType.Int32, forge_object.variant)]),
+                    BondValue(2, BondType.Int32, forge_object.variant_index),
+                ],
+            )
+        ],
+    )
+    return _struct(
+        0,
+        [
+            _struct(2, [BondValue(0, BondType.Int32, forge_object.global_id)]),
+            _vector(3, forge_object.position),
+            _vector(4, forge_object.rotation_up),
+            _vector(5, forge_object.rotation_forward),
+            _struct(8, [material, scale, variant]),
+        ],
+    )
+
+
+def get_folder_entry_struct(entry: ForgeFolderEntry, in_root: bool) -> BondValue:
+    """
+    Creates the struct of an object entry of a folder, the counterpart of `get_objects`.
+
+    Args:
+    - entry: Entry to create the struct of.
+    - in_root: Whether the entry is listed directly in a top level folder. These entries carry
+    field 0, which `get_category` uses to tell them apart from subfolders.
+
+    Returns:
+    - Struct of the entry.
+    """
+    fields = [
+        BondValue(2, BondType.Wstring, entry.name),
+        BondValue(6, BondType.Uint32, entry.parent),
+        BondValue(8, BondType.Int32, entry.index),
+    ]
+    if in_root:
+        fields.insert(0, BondValue(0, BondType.Int32, entry.index))
+    return _struct(0, fields)
+
+
+def get_category_struct(folder: ForgeFolder) -> BondValue:
+    """
+    Creates the struct of a top level folder and its subfolders, the counterpart of one folder
+    of `get_category`.
+
+    Args:
+    - folder: Folder to create the struct of.
+
+    Returns:
+    - Struct of the folder.
+    """
+    entries = [get_folder_entry_struct(entry, True) for entry in folder.objects]
+    for subfolder in folder.subcategories:
+        entries.append(
+            _struct(
+                0,
+                [
+                    BondValue(1, BondType.Uint32, subfolder.id),
+                    BondValue(2, BondType.Wstring, subfolder.name),
+                    BondValue(5, BondType.Uint32, subfolder.parent),
+                    _list(
+                        7,
+                        [get_folder_entry_struct(entry, False) for entry in subfolder.objects],
+                    ),
+                ],
+            )
+        )
+    fields = [_list(1, entries), BondValue(2, BondType.Wstring, folder.name)]
+    if folder.id != _ROOT_FOLDER_ID:
+        fields.insert(0, BondValue(0, BondType.Uint32, folder.id))
+    return _struct(0, fields)
+
+
+def get_layer_struct(id: int, layer: ForgeLayer) -> BondValue:
+    """
+    Creates the struct of a material layer, the counterpart of `read_layer`.
+
+    Args:
+    - id: Field ID of the layer in its material.
+    - layer: Layer to create the struct of.
+
+    Returns:
+    - Struct of the layer.
+    """
+    return _struct(
+        id,
+        [
+            _list(1, [BondValue(0, BondType.Uint32, layer.swatch)]),
+            BondValue(3, BondType.Float, layer.color_intensity),
+            BondValue(4, BondType.Float, layer.roughness),
+            BondValue(5, BondType.Bool, layer.force_metallic),
+            BondValue(6, BondType.Bool, layer.force_off_metallic),
+            BondValue(8, BondType.Float, layer.color_spread),
+            BondValue(10, BondType.Uint32, layer.color),
+        ],
+    )
+
+
+def get_material_struct(material: ForgeMat) -> BondValue:
+    """
+    Creates the struct of a material, the counterpart of `read_material`.
+
+    Args:
+    - material: Material to create the struct of, with at most four layers.
+
+    Returns:
+    - Struct of the material.
+    """
+    fields = [_list(1, [BondValue(0, BondType.Uint32, material.name)])]
+    fields += [get_layer_struct(id, layer) for id, layer in zip(range(3, 7), material.layers)]
+    fields += [
+        _list(8, [BondValue(0, BondType.Uint32, material.grime)]),
+        BondValue(9, BondType.Float, material.scratch_amount),
+        BondValue(10, BondType.Float, material.grime_amount),
+    ]
+    return _struct(0, fields)
+
+
+def get_level_struct(level: ForgeLevel) -> BondValue:
+    """
+    Creates the base struct of a map, the counterpart of `iter_forge_map`.
+
+    Args:
+    - level: Level to create the struct of. The index and folder of every object are derived
+    when reading and are not written.
+
+    Returns:
+    - Base struct of the map.
+    """
+    folders = _struct(
+        6,
+        [
+            _list(0, [get_category_struct(folder) for folder in level.categories]),
+            BondValue(1, BondType.Uint32, level.root_category),
+        ],
+    )
+    return _struct(
+        0,
+        [
+            _list(3, [get_object_struct(forge_object) for forge_object in level.objects]),
+            folders,
+            _list(8, [get_material_struct(material) for material in level.materials]),
+        ],
+    )
+
+
+def write_forge_map(level: ForgeLevel) -> bytes:
+    """
+    Encodes a level as a forge map file that `read_forge_map` can read.
+
+    Args:
+    - level: Level to encode.
+
+    Returns:
+    - Contents of the map file.
+    """
+    return write_base_struct(get_level_struct(level))
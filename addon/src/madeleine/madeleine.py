@@ -3,13 +3,23 @@
 from typing import Self
 from .bond_types import BondType
 
-__all__ = ["BondValue"]
+__all__ = ["BondValue", "BondValueType"]
+
+BondValueType = int | str | float | bool | list["BondValue"] | dict["BondValue", "BondValue"] | None
 
 
 class BondValue:
-    id: int = 0
-    type: BondType = BondType.Unavailable
-    value: int | str | float | bool | list[Self] | dict[Self, Self] | None = None
+    """
+    Decoded Bond value. The fields of structs are indexed by their ID on the first lookup,
+    keeping the first field if an ID is repeated.
+    """
+
+    __slots__ = ("_fields", "id", "type", "value")
+
+    id: int
+    type: BondType
+    value: int | str | float | bool | list[Self] | dict[Self, Self] | None
+    _fields: dict[int, Self] | None
 
     def __init__(
         self,
@@ -20,28 +30,30 @@ class BondValue:
         self.id = id
         self.type = type
         self.value = value
+        self._fields = None
 
     def get_elements(self) -> list[Self]:
         if self.type == BondType.List or self.type == BondType.Set or self.type == BondType.Struct:
-            if type(self.value) is list:
+            if isinstance(self.value, list):
                 return self.value
         return []
 
     def get_by_id(self, id: int) -> Self | None:
-        elements = self.get_elements()
-        for element in elements:
-            if element.id == id:
-                return element
-        return None
-
-    def traverse(self, *ids: int, index: int = 0) -> Self:
-        elements = self.get_elements()
-        for element in elements:
-            if element.id == ids[index]:
-                if index == len(ids) - 1:
-                    return element
-                return element.traverse(index + 1, *ids)
-        return self
+        if self._fields is None:
+            self._fields = {element.id: element for element in reversed(self.get_elements())}
+        return self._fields.get(id)
+
+    def traverse(self, *ids: int) -> Self:
+        """
+        Follows the given IDs through nested values, stopping at the last value that was found.
+        """
+        value = self
+        for id in ids:
+            element = value.get_by_id(id)
+            if element is None:
+                break
+            value = element
+        return value
 
     def get_value(self, index: int) -> Self | None:
         elements = self.get_elements()
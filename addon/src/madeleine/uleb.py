@@ -1,24 +1,37 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+__all__ = ["Buffer", "uleb128_decode", "sleb128_decode", "uleb128_encode", "sleb128_encode"]
 
-__all__ = ["uleb128_decode", "sleb128_decode"]
+Buffer = bytes | bytearray | memoryview
 
 
-def uleb128_decode(data: BufferedReader) -> int:
-    result = 0
-    shift = 0
-    b = 0
+def uleb128_decode(data: Buffer, offset: int) -> tuple[int, int]:
+    b = data[offset]
+    offset += 1
+    if b < 0x80:
+        return b, offset
+    result = b & 0x7F
+    shift = 7
     while True:
-        b = data.read(1)[0]
+        b = data[offset]
+        offset += 1
         result |= (b & 0x7F) << shift
-        if b & 0x80 == 0:
-            break
+        if b < 0x80:
+            return result, offset
         shift += 7
-    return result
 
 
-def sleb128_decode(data: BufferedReader) -> int:
-    u = uleb128_decode(data)
-    u = (u >> 1) ^ -(u & 1)
-    return u
+def sleb128_decode(data: Buffer, offset: int) -> tuple[int, int]:
+    u, offset = uleb128_decode(data, offset)
+    return (u >> 1) ^ -(u & 1), offset
+
+
+def uleb128_encode(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def sleb128_encode(out: bytearray, value: int) -> None:
+    uleb128_encode(out, (value << 1) ^ (value >> 63))
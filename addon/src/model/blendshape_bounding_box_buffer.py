@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
-
+from .reader import ModelReader
 from .vectors import Vector3
 
 __all__ = ["BlendShapeBoundingBox"]
@@ -14,7 +13,7 @@ class BlendShapeBoundingBox:
         self.normal_scale: Vector3 = Vector3()
         self.normal_offset: Vector3 = Vector3()
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: ModelReader) -> None:
         self.position_scale.read(reader)
         self.position_offset.read(reader)
         self.normal_scale.read(reader)
@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
+from .reader import ModelReader
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["BlendShapeIndexBuffer"]
@@ -11,13 +13,11 @@ class BlendShapeIndexBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.indices: list[int] = []
+        self.indices: npt.NDArray[np.int32] = np.empty(0, dtype=np.int32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Blendshape Index buffer stride was not 4!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            index = int.from_bytes(reader.read(4), "little", signed=True)
-            self.indices.append(index)
+        self.count = reader.read_u32()
+        self.indices = reader.read_array("<i4", self.count)
@@ -1,8 +1,12 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
-from .vectors import WordVector3DNormalizedWith4Word
+from collections.abc import Iterator
+
+from .reader import ModelReader
+from .vectors import WordVector3DNormalizedWith4Word, unpack_unorm16
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["BlendShapePositionBuffer"]
@@ -12,21 +16,52 @@ class BlendShapePositionBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.positions: list[list[WordVector3DNormalizedWith4Word]] = []
+        self.data: npt.NDArray[np.uint16] = np.empty((0, 4), dtype=np.uint16)
+        self.positions: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
+        self.shape_indices: npt.NDArray[np.uint16] = np.empty(0, dtype=np.uint16)
+        self.offsets: npt.NDArray[np.intp] = np.zeros(1, dtype=np.intp)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        """
+        Reads the buffer and groups the positions by blendshape with a single stable sort, so
+        that the positions of every shape are stored contiguously and keep their file order.
+        """
+        self.stride = reader.read_i8()
         if self.stride != 8:
             raise IncorrectStrideValue("Blendshape position buffer stride was not 8!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        positions: list[WordVector3DNormalizedWith4Word] = []
-        for _ in range(self.count):
-            position = WordVector3DNormalizedWith4Word()
-            position.read(reader)
-            positions.append(position)
-
-        unique_index: set[int] = set()
-        unique_index.update([x.index for x in positions])
-
-        for unique in unique_index:
-            self.positions.append([x for x in positions if x.index == unique])
+        self.count = reader.read_u32()
+        self.data = reader.read_array("<u2", self.count * 4).reshape(self.count, 4)
+
+        order = np.argsort(self.data[:, 3], kind="stable")
+        grouped = self.data[order]
+        self.positions = unpack_unorm16(grouped[:, :3])
+        self.shape_indices, starts = np.unique(grouped[:, 3], return_index=True)
+        self.offsets = np.append(starts, self.count)
+
+    def shape(self, index: int) -> npt.NDArray[np.float32]:
+        """
+        Gets the positions of the n-th blendshape of the buffer, as a view.
+        """
+        return self.positions[self.offsets[index] : self.offsets[index + 1]]
+
+    def shapes(self) -> Iterator[tuple[int, npt.NDArray[np.float32]]]:
+        """
+        Iterates over the (shape index, positions) of every blendshape, in ascending index order.
+        """
+        for i, shape_index in enumerate(self.shape_indices.tolist()):
+            yield shape_index, self.shape(i)
+
+    def vectors(self) -> list[list[WordVector3DNormalizedWith4Word]]:
+        """
+        Creates a vector object per position, grouped by blendshape. Prefer `shapes` unless
+        per-vertex objects are needed.
+        """
+        vectors: list[list[WordVector3DNormalizedWith4Word]] = []
+        for shape_index, positions in self.shapes():
+            shape: list[WordVector3DNormalizedWith4Word] = []
+            for x, y, z in positions.tolist():
+                vector = WordVector3DNormalizedWith4Word()
+                vector.x, vector.y, vector.z, vector.index = x, y, z, shape_index
+                shape.append(vector)
+            vectors.append(shape)
+        return vectors
@@ -1,9 +1,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import struct
+
+from .reader import ModelReader
 
 __all__ = ["BufferFlags"]
 
+_FLAGS = struct.Struct("<11?")
+
 
 class BufferFlags:
     def __init__(self) -> None:
@@ -19,15 +23,17 @@ class BufferFlags:
         self.has_blendshape_index: bool = False
         self.has_blendshape_position: bool = False
 
-    def read(self, reader: BufferedReader) -> None:
-        self.has_position = bool.from_bytes(reader.read(1))
-        self.has_uv0 = bool.from_bytes(reader.read(1))
-        self.has_uv1 = bool.from_bytes(reader.read(1))
-        self.has_uv2 = bool.from_bytes(reader.read(1))
-        self.has_normal = bool.from_bytes(reader.read(1))
-        self.has_color = bool.from_bytes(reader.read(1))
-        self.has_blend_indices = bool.from_bytes(reader.read(1))
-        self.has_blend_weights = bool.from_bytes(reader.read(1))
-        self.has_blend_weights_extra = bool.from_bytes(reader.read(1))
-        self.has_blendshape_index = bool.from_bytes(reader.read(1))
-        self.has_blendshape_position = bool.from_bytes(reader.read(1))
+    def read(self, reader: ModelReader) -> None:
+        (
+            self.has_position,
+            self.has_uv0,
+            self.has_uv1,
+            self.has_uv2,
+            self.has_normal,
+            self.has_color,
+            self.has_blend_indices,
+            self.has_blend_weights,
+            self.has_blend_weights_extra,
+            self.has_blendshape_index,
+            self.has_blendshape_position,
+        ) = reader.unpack(_FLAGS)
@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
+from .reader import ModelReader
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["ColorBuffer"]
@@ -11,16 +13,17 @@ class ColorBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.color: list[tuple[int, int, int, int]] = []
+        self.color: npt.NDArray[np.uint8] = np.empty((0, 4), dtype=np.uint8)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Color buffer stride was not 4!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            a = int.from_bytes(reader.read(1))
-            r = int.from_bytes(reader.read(1))
-            g = int.from_bytes(reader.read(1))
-            b = int.from_bytes(reader.read(1))
-            self.color.append((a, r, g, b))
+        self.count = reader.read_u32()
+        self.color = reader.read_array(np.uint8, self.count * 4).reshape(self.count, 4)
+
+    def colors(self) -> list[tuple[int, int, int, int]]:
+        """
+        Creates an (a, r, g, b) tuple per color. Prefer `color` unless per-vertex tuples are needed.
+        """
+        return [(a, r, g, b) for a, r, g, b in self.color.tolist()]
@@ -0,0 +1,145 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import numpy as np
+import numpy.typing as npt
+
+from collections.abc import Iterator
+from typing import Self
+
+from .bounding_box import BoundingBox
+from .section import Section
+
+__all__ = ["SectionGeometry"]
+
+
+class SectionGeometry:
+    """
+    Decoded geometry of a section, with the bounding box compression already applied.
+    Optional buffers that are not present in the section are left as `None`.
+    """
+
+    ARRAYS: tuple[str, ...] = (
+        "positions",
+        "normals",
+        "indices",
+        "uv0",
+        "uv1",
+        "uv2",
+        "colors",
+        "blend_vertices",
+        "blend_bones",
+        "blend_weights",
+    )
+
+    def __init__(self) -> None:
+        self.positions: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
+        self.normals: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
+        self.indices: npt.NDArray[np.uint32] = np.empty(0, dtype=np.uint32)
+        self.uv0: npt.NDArray[np.float32] | None = None
+        self.uv1: npt.NDArray[np.float32] | None = None
+        self.uv2: npt.NDArray[np.float32] | None = None
+        self.colors: npt.NDArray[np.uint8] | None = None
+        self.blend_vertices: npt.NDArray[np.int32] | None = None
+        self.blend_bones: npt.NDArray[np.uint16] | None = None
+        self.blend_weights: npt.NDArray[np.float32] | None = None
+
+    @classmethod
+    def from_section(cls, section: Section, bounding_box: BoundingBox) -> Self:
+        """
+        Decodes the buffers of a section and applies the compression bounds of the model to them.
+
+        Args:
+        - section: The section to decode.
+        - bounding_box: The bounding box holding the compression bounds of the model.
+
+        Returns:
+        - The scaled geometry of the section.
+        """
+        geometry = cls()
+        buffers = section.vertex_buffer
+        flags = section.vertex_flags
+        geometry.positions = _decompress(
+            buffers.position_buffer.positions[:, :3], bounding_box.model_scale
+        )
+        geometry.normals = np.ascontiguousarray(buffers.normal_buffer.normals[:, :3])
+        geometry.indices = section.index_buffer.indices.astype(np.uint32)
+        if flags.has_uv0:
+            geometry.uv0 = _decompress_uv(buffers.uv0_buffer.uv, bounding_box.uv_scale)
+        if flags.has_uv1:
+            geometry.uv1 = _decompress_uv(buffers.uv1_buffer.uv, bounding_box.uv1_scale)
+        if flags.has_uv2:
+            geometry.uv2 = _decompress_uv(buffers.uv2_buffer.uv, bounding_box.uv2_scale)
+        if flags.has_color:
+            geometry.colors = np.array(buffers.color_buffer.color)
+        if flags.has_blend_indices:
+            geometry.blend_vertices, geometry.blend_bones, geometry.blend_weights = (
+                buffers.blend_pairs(section.vertex_type)
+            )
+        return geometry
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, npt.NDArray[np.generic]]) -> Self:
+        """
+        Creates geometry from named arrays, as returned by `arrays`.
+        """
+        geometry = cls()
+        for name, array in arrays.items():
+            if name in cls.ARRAYS:
+                setattr(geometry, name, array)
+        return geometry
+
+    def arrays(self) -> dict[str, npt.NDArray[np.generic]]:
+        """
+        Gets all present arrays of the geometry by name.
+        """
+        arrays: dict[str, npt.NDArray[np.generic]] = {}
+        for name in self.ARRAYS:
+            array: npt.NDArray[np.generic] | None = getattr(self, name)
+            if array is not None:
+                arrays[name] = array
+        return arrays
+
+    def weight_groups(self) -> Iterator[tuple[int, float, npt.NDArray[np.int32]]]:
+        """
+        Groups the skinned vertices by bone and weight, so each group can be assigned at once.
+
+        Returns:
+        - An iterator of (bone, weight, vertices) tuples.
+        """
+        if self.blend_vertices is None or self.blend_bones is None or self.blend_weights is None:
+            return
+        order = np.lexsort((self.blend_weights, self.blend_bones))
+        vertices = self.blend_vertices[order]
+        bones = self.blend_bones[order]
+        weights = self.blend_weights[order]
+        changes = (bones[1:] != bones[:-1]) | (weights[1:] != weights[:-1])
+        starts = np.concatenate(([0], np.flatnonzero(changes) + 1))
+        ends = np.append(starts[1:], len(vertices))
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            if start < end:
+                yield int(bones[start]), float(weights[start]), vertices[start:end]
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.positions)
+
+
+def _decompress(
+    values: npt.NDArray[np.float32], scale: list[tuple[float, float, float]]
+) -> npt.NDArray[np.float32]:
+    """
+    Maps normalized values to the (min, max, extent) bounds of each axis.
+    """
+    bounds = np.array(scale, dtype=np.float64)
+    return (values * bounds[:, 2] + bounds[:, 0]).astype(np.float32)
+
+
+def _decompress_uv(
+    uv: npt.NDArray[np.float32], scale: list[tuple[float, float, float]]
+) -> npt.NDArray[np.float32]:
+    """
+    Maps normalized texture coordinates to their bounds, flipping V for Blender.
+    """
+    uv = _decompress(uv, scale)
+    uv[:, 1] = 1 - uv[:, 1]
+    return uv
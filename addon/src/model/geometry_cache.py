@@ -0,0 +1,165 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import hashlib
+import json
+import logging
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from .geometry import SectionGeometry
+from .metadata import Model
+from .reader import ModelReader
+
+__all__ = ["GeometryCache", "get_section_geometry"]
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = "EKGC"
+_VERSION = 2
+_HEADER = struct.Struct("<4sII")
+_ALIGNMENT = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class GeometryCache:
+    """
+    On-disk cache of decoded section geometry.
+
+    Each section is stored in its own file, holding a JSON description of the arrays followed by
+    their raw, aligned data. Entries are read in one go on load, and are only used if the path,
+    size and modification time of the source model match the ones they were created from.
+    """
+
+    def __init__(self, folder: str | Path) -> None:
+        self.folder: Path = Path(folder)
+
+    def load(self, model_path: str | Path, section_index: int) -> SectionGeometry | None:
+        """
+        Loads the cached geometry of a section.
+
+        Args:
+        - model_path: The path to the source model file.
+        - section_index: The index of the section in the model.
+
+        Returns:
+        - The cached geometry, or None if there is no valid entry for the model.
+        """
+        entry = self._entry_path(model_path, section_index)
+        if not entry.exists():
+            return None
+        try:
+            # Read rather than mapped, so the loaded arrays do not keep the entry open
+            with ModelReader.read_file(entry) as reader:
+                magic, version, header_size = reader.unpack(_HEADER)  # pyright: ignore[reportAny]
+                if magic != _MAGIC.encode() or version != _VERSION:
+                    return None
+                header = json.loads(reader.read_string(header_size))  # pyright: ignore[reportAny]
+                if header["key"] != self._key(model_path):
+                    return None
+                data_offset = _align(_HEADER.size + header_size)
+                arrays: dict[str, npt.NDArray[np.generic]] = {}
+                for name, (dtype, shape, offset) in header["arrays"].items():  # pyright: ignore[reportAny]
+                    reader.seek(data_offset + offset)  # pyright: ignore[reportAny]
+                    arrays[name] = reader.read_array(dtype, math.prod(shape)).reshape(shape)  # pyright: ignore[reportAny]
+                return SectionGeometry.from_arrays(arrays)
+        except (OSError, EOFError, ValueError, KeyError, TypeError, struct.error) as e:
+            logger.warning(f"Ignoring invalid geometry cache entry {entry}: {e}")
+            return None
+
+    def store(self, model_path: str | Path, section_index: int, geometry: SectionGeometry) -> None:
+        """
+        Stores the geometry of a section, replacing any existing entry.
+
+        Args:
+        - model_path: The path to the source model file.
+        - section_index: The index of the section in the model.
+        - geometry: The decoded geometry of the section.
+        """
+        arrays = {name: np.ascontiguousarray(array) for name, array in geometry.arrays().items()}
+        layout: dict[str, tuple[str, tuple[int, ...], int]] = {}
+        offset = 0
+        for name, array in arrays.items():
+            layout[name] = (array.dtype.str, array.shape, offset)
+            offset = _align(offset + array.nbytes)
+        header = json.dumps({"key": self._key(model_path), "arrays": layout}).encode()
+
+        entry = self._entry_path(model_path, section_index)
+        temp = entry.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(temp, "wb") as f:
+                _ = f.write(_HEADER.pack(_MAGIC.encode(), _VERSION, len(header)))
+                _ = f.write(header)
+                data_offset = _align(f.tell())
+                for name, array in arrays.items():
+                    _ = f.seek(data_offset + layout[name][2])
+                    _ = f.write(array.data)
+            os.replace(temp, entry)
+        except OSError as e:
+            logger.warning(f"Failed to write geometry cache entry {entry}: {e}")
+            temp.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache. Entries that are still memory-mapped by a loaded
+        model cannot be removed on every platform, these are skipped.
+        """
+        if not self.folder.exists():
+            return
+        for entry in self.folder.glob("*.ekgc"):
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Failed to remove geometry cache entry {entry}: {e}")
+
+    def _entry_path(self, model_path: str | Path, section_index: int) -> Path:
+        path = Path(model_path).resolve()
+        digest = hashlib.sha1(str(path).encode()).hexdigest()[:16]
+        return self.folder / f"{path.stem}_{digest}_{section_index}.ekgc"
+
+    @staticmethod
+    def _key(model_path: str | Path) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        path = Path(model_path).resolve()
+        stat = path.stat()
+        return {"path": str(path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def get_section_geometry(
+    model: Model, model_path: str | Path, index: int, cache: GeometryCache | None = None
+) -> SectionGeometry | None:
+    """
+    Gets the scaled geometry of a section. Geometry is kept on the model for repeat imports,
+    and is otherwise loaded from the geometry cache if it holds a valid entry for the model.
+    If neither has it, the section is decoded and, if a cache is given, stored.
+
+    Args:
+    - model: The model the section belongs to.
+    - model_path: The path to the model file.
+    - index: The index of the section.
+    - cache: Optional geometry cache to load from and store to.
+
+    Returns:
+    - The geometry of the section, or None if the model has no bounding box to scale it with.
+    """
+    if len(model.bounding_boxes) == 0:
+        return None
+    geometry = model.geometry.get(index)
+    if geometry:
+        return geometry
+    if cache:
+        geometry = cache.load(model_path, index)
+    if geometry is None:
+        geometry = SectionGeometry.from_section(model.sections[index], model.bounding_boxes[0])
+        if cache:
+            cache.store(model_path, index, geometry)
+    model.geometry[index] = geometry
+    return geometry
@@ -9,6 +9,7 @@ from mathutils import Matrix
 from typing import cast
 from functools import reduce
 
+from .convert import to_matrix
 from ..bone import Bone
 from ..metadata import Model
 from ...ui.model_options import get_model_options
@@ -68,7 +69,7 @@ def get_bone_transforms(model: Model) -> list[Matrix]:
     for bone in model.bones:
         lineage = _get_bone_lineage(model, bone)
         transforms = [
-            _create_transform(x.rotation_matrix.matrix, x.transformation_matrix.matrix)
+            _create_transform(to_matrix(x.rotation_matrix), to_matrix(x.transformation_matrix))
             for x in lineage
         ]
         res = cast(Matrix, reduce(operator.matmul, transforms))
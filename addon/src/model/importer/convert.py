@@ -0,0 +1,28 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+from mathutils import Matrix, Quaternion, Vector
+
+from ..vectors import Matrix4x4, Vector3, Vector4
+
+__all__ = ["to_matrix", "to_quaternion", "to_vector"]
+
+
+def to_vector(vector: Vector3 | Vector4) -> Vector:
+    """
+    Converts a parsed vector to a mathutils vector.
+    """
+    return Vector(vector.to_tuple())
+
+
+def to_quaternion(vector: Vector4) -> Quaternion:
+    """
+    Converts a parsed four component vector to a mathutils quaternion, in (w, x, y, z) order.
+    """
+    return Quaternion(vector.to_tuple())
+
+
+def to_matrix(matrix: Matrix4x4) -> Matrix:
+    """
+    Converts a parsed matrix to a mathutils matrix, row by row.
+    """
+    return Matrix(matrix.to_tuple())
@@ -0,0 +1,93 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+from collections.abc import Sequence
+from typing import cast
+
+import bpy
+import numpy as np
+from bpy.types import Collection, NodesModifier, Object
+
+from ...nodes.point_instancer import ROTATION_ATTRIBUTE, SCALE_ATTRIBUTE, PointInstancer
+
+__all__ = ["PointInstances"]
+
+
+class PointInstances:
+    """
+    Collects placements of imported objects, to create a single point mesh per source object and
+    collection that instances the source object on its points through geometry nodes. The amount
+    of created objects then depends on the amount of unique geometry and not on the placements.
+    """
+
+    def __init__(self) -> None:
+        self._sources: dict[tuple[str, str], tuple[Object, Collection]] = {}
+        self._positions: dict[tuple[str, str], list[Sequence[float]]] = {}
+        self._rotations: dict[tuple[str, str], list[Sequence[float]]] = {}
+        self._scales: dict[tuple[str, str], list[Sequence[float]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(positions) for positions in self._positions.values())
+
+    def add(
+        self,
+        source: Object,
+        collection: Collection,
+        position: Sequence[float],
+        rotation: Sequence[float],
+        scale: Sequence[float],
+    ) -> None:
+        """
+        Adds a placement of an object.
+
+        Args:
+        - source: The object to instance, its own transform is ignored.
+        - collection: The collection to link the point mesh of the placement to.
+        - position: The location of the placement.
+        - rotation: The rotation of the placement, as a (w, x, y, z) quaternion.
+        - scale: The scale of the placement.
+        """
+        key = (source.name, collection.name)
+        if key not in self._sources:
+            self._sources[key] = (source, collection)
+            self._positions[key] = []
+            self._rotations[key] = []
+            self._scales[key] = []
+        self._positions[key].append(position)
+        self._rotations[key].append(rotation)
+        self._scales[key].append(scale)
+
+    def create(self) -> list[Object]:
+        """
+        Creates the point mesh objects of every added placement.
+
+        Returns:
+        - The created point mesh objects.
+        """
+        node_group = PointInstancer().node_tree
+        objects: list[Object] = []
+        for key, (source, collection) in self._sources.items():
+            positions = np.array(self._positions[key], dtype=np.float32).reshape(-1, 3)
+            rotations = np.array(self._rotations[key], dtype=np.float32).reshape(-1, 4)
+            scales = np.array(self._scales[key], dtype=np.float32).reshape(-1, 3)
+
+            mesh = bpy.data.meshes.new(f"{source.name}_points")
+            mesh.vertices.add(len(positions))  # pyright: ignore[reportUnknownMemberType]
+            mesh.vertices.foreach_set("co", positions.ravel())  # pyright: ignore[reportUnknownMemberType]
+            rotation = mesh.attributes.new(ROTATION_ATTRIBUTE, "QUATERNION", "POINT")
+            rotation.data.foreach_set("value", rotations.ravel())  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+            scale = mesh.attributes.new(SCALE_ATTRIBUTE, "FLOAT_VECTOR", "POINT")
+            scale.data.foreach_set("vector", scales.ravel())  # pyright: ignore[reportUnknownMemberType, reportAttributeAccessIssue]
+            mesh.update()  # pyright: ignore[reportUnknownMemberType]
+
+            obj = bpy.data.objects.new(f"{source.name}_points", mesh)
+            modifier = cast(NodesModifier, obj.modifiers.new("Point Instancer", "NODES"))
+            if node_group:
+                modifier.node_group = node_group
+                modifier[node_group.interface.items_tree["Object"].identifier] = source  # pyright: ignore[reportAttributeAccessIssue]
+            collection.objects.link(obj)  # pyright: ignore[reportUnknownMemberType]
+            objects.append(obj)
+        self._sources.clear()
+        self._positions.clear()
+        self._rotations.clear()
+        self._scales.clear()
+        return objects
@@ -3,9 +3,10 @@
 import bpy
 
 from bpy.types import Object
-from mathutils import Matrix, Quaternion, Vector
+from mathutils import Matrix, Vector
 
 from .bone import get_bone_transforms
+from .convert import to_quaternion
 from ..marker import Marker, MarkerInstance
 from ..metadata import Model
 from ...ui.model_options import get_model_options
@@ -65,8 +66,8 @@ def import_markers(model: Model, armature: Object) -> list[Object]:
                 (props.scale_factor,) * 3
             )
             world_transform = (
-                Matrix.Translation([v for v in instance.position.vector])
-                @ Quaternion(instance.rotation.vector).to_matrix().to_4x4()
+                Matrix.Translation(instance.position.to_tuple())
+                @ to_quaternion(instance.rotation).to_matrix().to_4x4()
             )
 
             if instance.node_index != 255 and len(bone_transforms) > instance.node_index:
@@ -2,23 +2,62 @@
 # Copyright © 2025 Surasia
 import logging
 import bpy
+import numpy as np
+import numpy.typing as npt
 
+from collections.abc import Callable, Iterable
 from pathlib import Path
 from typing import cast
 from bpy.types import ArmatureModifier, Material, Mesh, Object
 from mathutils import Vector
 
 from .bone import import_bones
+from .convert import to_vector
 from .markers import import_markers
 from ..rtgo_offset import RtgoOffset
+from ..geometry import SectionGeometry
+from ..geometry_cache import GeometryCache, get_section_geometry
 from ..metadata import Model
+from ..model_cache import model_cache
+from ..prefetch import prefetch_models
 from ..section import Section
-from ..vectors import NormalizedVector2
 from ...constants import FEET_TO_METER
 from ...ui.model_options import get_model_options
+from ...utils import get_addon_preferences, get_geometry_cache_folder
 
 
-__all__ = ["ModelImporter"]
+__all__ = ["ModelImporter", "SectionFilter", "prefetch_imports"]
+
+SectionFilter = Callable[[Model], Iterable[int]]
+
+
+def prefetch_imports(requests: Iterable[tuple[str, SectionFilter | None]]) -> None:
+    """
+    Decodes the models that are about to be imported in worker processes, if enabled.
+
+    Args:
+    - requests: Pairs of model paths and the section filters they will be imported with.
+    """
+    prefs = get_addon_preferences()
+    if not prefs.use_parallel_decoding:
+        return
+    model_cache.budget = prefs.model_cache_budget * 1024 * 1024
+    cache_folder = get_geometry_cache_folder() if prefs.use_geometry_cache else None
+    prefetch_models(requests, cache_folder)
+
+
+def _has_invalid_indices(geometry: SectionGeometry) -> bool:
+    """
+    Checks whether any of the indices of the geometry point past its vertices, or whether any of
+    its triangles is degenerate, using the same vertex more than once.
+    """
+    if len(geometry.indices) == 0:
+        return False
+    if int(geometry.indices.max()) >= geometry.vertex_count:
+        return True
+    triangles = geometry.indices[: len(geometry.indices) // 3 * 3].reshape(-1, 3)
+    i0, i1, i2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    return bool(np.any((i0 == i1) | (i1 == i2) | (i0 == i2)))
 
 
 class ModelImporter:
@@ -26,6 +65,11 @@ class ModelImporter:
         self.model: Model = Model()
         self.markers: list[Object] = []
         self.rig: Object | None = None
+        self.materials: list[int] = []
+        self.blender_materials: list[Material] = []
+        self.model_path: str = ""
+        self.cache: GeometryCache | None = None
+        self.validate: bool = False
 
     def start_import(
         self,
@@ -33,6 +77,7 @@ class ModelImporter:
         bones: bool = True,
         materials: list[int] | None = None,
         custom_rig: Object | None = None,
+        section_filter: SectionFilter | None = None,
     ) -> list[Object]:
         """
         Imports the model from the given path.
@@ -42,6 +87,8 @@ class ModelImporter:
         - bones: Whether to import bones.
         - materials: Optional list of materials to use (useful for RTGOs)
         - custom_rig: Optional custom rig to use.
+        - section_filter: Optional callable returning the indices of the sections to import.
+          Sections left out are never decoded.
 
         Returns:
         - The list of imported objects.
@@ -51,10 +98,18 @@ class ModelImporter:
         if not model.exists() or model.is_dir():
             logging.warning(f"Model path does not exist: {model}")
             return []
-        with open(model_path, "rb") as f:
-            self.model.read(f)
-        if materials:
-            self.model.materials = materials
+        prefs = get_addon_preferences()
+        model_cache.budget = prefs.model_cache_budget * 1024 * 1024
+        self.model_path = model_path
+        try:
+            self.model = model_cache.get(model_path)
+        except OSError as e:
+            logging.warning(f"Failed to read model {model}: {e}")
+            return []
+        self.materials = materials if materials else self.model.materials
+        if prefs.use_geometry_cache:
+            self.cache = GeometryCache(get_geometry_cache_folder())
+        self.validate = prefs.validate_meshes
         if options.import_bones and bones:
             if custom_rig is None:
                 self.rig = import_bones(self.model)
@@ -64,35 +119,29 @@ class ModelImporter:
                 self.rig = custom_rig
             if options.import_markers:
                 self.markers = import_markers(self.model, self.rig)
-            objects = self._import_model()
+            objects = self._import_model(section_filter)
         else:
-            objects = self._import_model()
+            objects = self._import_model(section_filter)
         return objects
 
     def _create_uv(
         self,
         mesh: Mesh,
-        uv: list[NormalizedVector2],
-        uv_scale: list[tuple[float, float, float]],
+        uv: npt.NDArray[np.float32],
+        loop_vertices: npt.NDArray[np.int32],
         index: int,
     ) -> None:
         """
-        Create a UV layer for the mesh. Gets compression info from the bounding box, scales the UVs,
-        and assigns them to the mesh.
+        Create a UV layer for the mesh, gathering the already scaled per-vertex UVs to the loops.
 
         Args:
         - mesh: The mesh to create the UV layer for.
         - uv: The UV coordinates to assign.
-        - uv_scale: The UV scale (compression) to apply.
+        - loop_vertices: The vertex index of every loop of the mesh.
         - index: The index of the UV layer.
         """
-        uv0 = [x.vector for x in uv]
         uv_layer = mesh.uv_layers.new(name=f"UV{index}")
-        for loop in range(len(mesh.loops)):
-            uv_layer.data[mesh.loops[loop].index].uv = (
-                uv0[mesh.loops[loop].vertex_index][0] * uv_scale[0][2] + uv_scale[0][0],
-                1 - (uv0[mesh.loops[loop].vertex_index][1] * uv_scale[1][2] + uv_scale[1][0]),
-            )
+        uv_layer.data.foreach_set("uv", uv[loop_vertices].ravel())  # pyright: ignore[reportUnknownMemberType]
 
     def _create_material_indices(self, section: Section, mesh: Mesh) -> None:
         """
@@ -102,35 +151,29 @@ class ModelImporter:
         - section: The section to create the material indices for.
         - mesh: The mesh to assign the materials to.
         """
-        material_slots: dict[int, Material] = {}
-        material_slot_indices: dict[int, int] = {}
-        for submesh in range(len(section.submeshes)):
-            first_face = section.submeshes[submesh].index_start
-            face_count = section.submeshes[submesh].index_count
-            part_faces = mesh.polygons[first_face // 3 : (first_face + face_count) // 3]
-            if section.submeshes[submesh].shader_index >= len(self.model.materials):
+        material_index = np.zeros(len(mesh.polygons), dtype=np.int32)
+        slots: dict[str, int] = {}
+        for submesh in section.submeshes:
+            if not 0 <= submesh.shader_index < len(self.blender_materials):
                 continue
-            mat_name = str(self.model.materials[section.submeshes[submesh].shader_index])
-            m = bpy.data.materials.get(mat_name)
-            if not m:
-                m = bpy.data.materials.new(mat_name)
-            m.use_nodes = True
-            if m.name not in mesh.materials:
-                mesh.materials.append(m)  # pyright: ignore[reportUnknownMemberType]
-            if len(mesh.materials) > 0:
-                mat = mesh.materials[-1]
-                if mat:
-                    material_slots[section.submeshes[submesh].shader_index] = mat
-                material_slot_indices[section.submeshes[submesh].shader_index] = len(
-                    material_slot_indices
-                )
-                for face in part_faces:
-                    face.material_index = material_slot_indices[
-                        section.submeshes[submesh].shader_index
-                    ]
+            material = self.blender_materials[submesh.shader_index]
+            slot = slots.get(material.name)
+            if slot is None:
+                slot = slots[material.name] = len(mesh.materials)
+                mesh.materials.append(material)  # pyright: ignore[reportUnknownMemberType]
+            first_face = submesh.index_start // 3
+            material_index[first_face : (submesh.index_start + submesh.index_count) // 3] = slot
+        if slots:
+            mesh.polygons.foreach_set("material_index", material_index)
 
     def _create_skinning(
-        self, obj: Object, name: str, armature: Object, section: Section, mesh: Mesh
+        self,
+        obj: Object,
+        name: str,
+        armature: Object,
+        section: Section,
+        geometry: SectionGeometry,
+        mesh: Mesh,
     ) -> None:
         """
         Create skinning for the mesh. Assigns vertex groups to the mesh based on the bone indices and weights.
@@ -140,9 +183,10 @@ class ModelImporter:
         - name: The name of the collection to assign to the armature.
         - armature: The armature to assign the vertex groups to.
         - section: The section to create the skinning for.
+        - geometry: The geometry of the section.
         - mesh: The mesh to assign the vertex groups to.
         """
-        vertex_count = len(section.vertex_buffer.position_buffer.positions)
+        vertex_count = geometry.vertex_count
         modifier = cast(ArmatureModifier, obj.modifiers.new(f"{name}::armature", "ARMATURE"))
         if section.use_dual_quat:
             modifier.use_deform_preserve_volume = True
@@ -154,54 +198,87 @@ class ModelImporter:
             group = obj.vertex_groups.new(name=str(bone.name))
             group.add(range(vertex_count), 1.0, "REPLACE")  # pyright: ignore[reportUnknownMemberType]
         else:
-            for bone in self.model.bones:
-                _ = obj.vertex_groups.new(name=str(bone.name))
-            for (
-                vi,
-                blend_indicies,
-                blend_weights,
-            ) in section.vertex_buffer.enumerate_blendpairs(section.vertex_type):
-                for bi, bw in zip(blend_indicies, blend_weights):
-                    if bi <= len(obj.vertex_groups):
-                        obj.vertex_groups[bi].add([vi], bw, "REPLACE")  # pyright: ignore[reportUnknownMemberType]
-
-        # Removes that weird shading that happens when you twist a bone
-        for p in mesh.polygons:
-            p.use_smooth = True
-
-    def _create_color(self, section: Section, mesh: Mesh) -> None:
+            groups = [obj.vertex_groups.new(name=str(bone.name)) for bone in self.model.bones]
+            for bone, weight, vertices in geometry.weight_groups():
+                if bone < len(groups):
+                    groups[bone].add(vertices.tolist(), weight, "REPLACE")  # pyright: ignore[reportUnknownMemberType]
+
+    def _create_color(self, colors: npt.NDArray[np.uint8], mesh: Mesh) -> None:
         """
-        Create vertex colors for the mesh. Assigns vertex colors to the mesh based on the color buffer.
+        Create vertex colors for the mesh. Assigns the color buffer to a single per-vertex attribute,
+        keeping the stored bytes as they are. A buffer that does not match the vertices is cut
+        off or padded with white.
 
         Args:
-        - section: The section to create the vertex colors for.
+        - colors: The (a, r, g, b) colors of the section.
         - mesh: The mesh to assign the vertex colors to.
         """
-        for i, color in enumerate(section.vertex_buffer.color_buffer.color):
-            ca = mesh.color_attributes.new(name=f"Color{i}", type="BYTE_COLOR", domain="FACE")
-            for loop in range(len(mesh.loops) // 3):
-                ca.data[loop].color = color  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
-
-    def _create_normals(self, section: Section, mesh: Mesh) -> None:
+        vertex_count = len(mesh.vertices)
+        if len(colors) != vertex_count:
+            logging.warning(
+                f"Section {mesh.name} has {len(colors)} vertex colors for {vertex_count} vertices,"
+                + " missing colors are set to white"
+            )
+            padded = np.full((vertex_count, 4), 255, dtype=np.uint8)
+            count = min(len(colors), vertex_count)
+            padded[:count] = colors[:count]
+            colors = padded
+        rgba = colors[:, [1, 2, 3, 0]].astype(np.float32) / 255.0
+        ca = mesh.color_attributes.new(name="Color", type="BYTE_COLOR", domain="POINT")
+        ca.data.foreach_set("color_srgb", rgba.ravel())  # pyright: ignore[reportUnknownMemberType]
+
+    def _create_normals(self, geometry: SectionGeometry, mesh: Mesh) -> None:
         """
-        Create normals for the mesh. Assigns normals to the mesh based on the normal buffer.
+        Create normals for the mesh. Smooths every face at once, which also removes that weird
+        shading that happens when you twist a bone, and assigns the normal buffer as custom normals.
 
         Args:
-        - section: The section to create the normals for.
+        - geometry: The geometry of the section to create the normals for.
         - mesh: The mesh to assign the normals to.
         """
-        normals = [x.vector.to_tuple() for x in section.vertex_buffer.normal_buffer.normals]
         mesh.shade_smooth()  # pyright: ignore[reportUnknownMemberType]
-        mesh.normals_split_custom_set_from_vertices(normals)  # pyright: ignore[reportUnknownMemberType, reportArgumentType]
-        _ = mesh.validate()
-        mesh.update()  # pyright: ignore[reportUnknownMemberType]
+        mesh.normals_split_custom_set_from_vertices(geometry.normals)  # pyright: ignore[reportUnknownMemberType, reportArgumentType]
 
-    def _create_section(self, section: Section, offset: RtgoOffset | None = None) -> Object | None:
+    def _create_mesh(self, name: str, geometry: SectionGeometry) -> Mesh:
+        """
+        Create a triangle mesh from the geometry, filling its vertices, loops and faces directly
+        from the position and index arrays. The mesh is only validated if mesh validation is
+        enabled, if the index buffer points past the vertices or if it has degenerate triangles.
+
+        Args:
+        - name: The name of the mesh.
+        - geometry: The scaled geometry of the section.
+
+        Returns:
+        - The created mesh.
+        """
+        face_count = len(geometry.indices) // 3
+        mesh = bpy.data.meshes.new(name)
+        mesh.vertices.add(geometry.vertex_count)  # pyright: ignore[reportUnknownMemberType]
+        mesh.vertices.foreach_set("co", geometry.positions.ravel())  # pyright: ignore[reportUnknownMemberType]
+        mesh.loops.add(face_count * 3)  # pyright: ignore[reportUnknownMemberType]
+        mesh.loops.foreach_set(  # pyright: ignore[reportUnknownMemberType]
+            "vertex_index", geometry.indices[: face_count * 3].astype(np.int32)
+        )
+        mesh.polygons.add(face_count)  # pyright: ignore[reportUnknownMemberType]
+        mesh.polygons.foreach_set(  # pyright: ignore[reportUnknownMemberType]
+            "loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32)
+        )
+        mesh.update(calc_edges=True)  # pyright: ignore[reportUnknownMemberType]
+        if self.validate or _has_invalid_indices(geometry):
+            _ = mesh.validate()
+        return mesh
+
+    def _create_section(
+        self, section: Section, geometry: SectionGeometry, offset: RtgoOffset | None = None
+    ) -> Object:
         """
         Create a section (submesh) of the model.
 
         Args:
         - section: The section to create the object for.
+        - geometry: The scaled geometry of the section.
+        - offset: The RTGO offset of the section, if any.
 
         Returns:
         - The object representing the section.
@@ -211,73 +288,62 @@ class ModelImporter:
         collection_name = f"{self.model.header.tag_id}_{permutation_name}_{region_name}"
         options = get_model_options()
 
-        if len(self.model.bounding_boxes) == 0:
-            return None
-        model_scale = self.model.bounding_boxes[0].model_scale
-        uv_scale = self.model.bounding_boxes[0].uv_scale
-        uv_scale1 = self.model.bounding_boxes[0].uv1_scale
-        uv_scale2 = self.model.bounding_boxes[0].uv2_scale
-
-        verts = [x.vector for x in section.vertex_buffer.position_buffer.positions]
-        it = len(verts[0])
-        for i in range(len(verts)):
-            verts[i] = Vector(
-                [verts[i][j] * model_scale[j][-1] + model_scale[j][0] for j in range(it)]
-            )
-
-        ind = section.index_buffer.indices
-        faces = [(ind[x], ind[x + 1], ind[x + 2]) for x in range(0, len(ind), 3)]
-        mesh = bpy.data.meshes.new(collection_name)
+        mesh = self._create_mesh(collection_name, geometry)
         obj = bpy.data.objects.new(collection_name, mesh)
         obj["region_name"] = region_name
         obj["permutation_name"] = permutation_name
         obj.scale = Vector((FEET_TO_METER, FEET_TO_METER, FEET_TO_METER)) * Vector(
             (options.scale_factor,) * 3
         )
-        mesh.from_pydata(verts, [], faces)  # pyright: ignore[reportUnknownMemberType]
-        if section.vertex_flags.has_uv0:
-            self._create_uv(mesh, section.vertex_buffer.uv0_buffer.uv, uv_scale, 0)
-        if section.vertex_flags.has_uv1:
-            self._create_uv(mesh, section.vertex_buffer.uv1_buffer.uv, uv_scale1, 1)
-        if section.vertex_flags.has_uv2:
-            self._create_uv(mesh, section.vertex_buffer.uv2_buffer.uv, uv_scale2, 2)
+        loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get("vertex_index", loop_vertices)  # pyright: ignore[reportUnknownMemberType]
+        for index, uv in enumerate((geometry.uv0, geometry.uv1, geometry.uv2)):
+            if uv is not None:
+                self._create_uv(mesh, uv, loop_vertices, index)
 
         if options.import_materials:
             self._create_material_indices(section, mesh)
-        if options.import_vertex_color:
-            self._create_color(section, mesh)
+        if options.import_vertex_color and geometry.colors is not None:
+            self._create_color(geometry.colors, mesh)
         if self.rig and options.import_bones:
-            self._create_skinning(obj, collection_name, self.rig, section, mesh)
+            self._create_skinning(obj, collection_name, self.rig, section, geometry, mesh)
 
         if offset:
-            obj.location = offset.position.vector
+            obj.location = to_vector(offset.position)
             obj["permutation_name"] = offset.name
         return obj
 
-    def _import_model(self) -> list[Object]:
+    def _import_model(self, section_filter: SectionFilter | None = None) -> list[Object]:
         """
         Imports the model by creating sections.
 
+        Args:
+        - section_filter: Optional callable returning the indices of the sections to import.
+
         Returns:
         - The list of imported objects.
         """
-        materials: list[Material] = []
         options = get_model_options()
+        self.blender_materials = []
         if options.import_materials:
-            for mat in self.model.materials:
-                mat = bpy.data.materials.get(str(mat))
-                if not mat:
-                    mat = bpy.data.materials.new(str(mat))
-                materials.append(mat)
+            for mat in self.materials:
+                material = bpy.data.materials.get(str(mat))
+                if not material:
+                    material = bpy.data.materials.new(str(mat))
+                material.use_nodes = True
+                self.blender_materials.append(material)
         objects: list[Object] = []
 
-        for idx, section in enumerate(self.model.sections):
-            per_mesh_data = None
-            per_mesh_datas = [pmd for pmd in self.model.offsets if pmd.mesh_index == idx]
-            if per_mesh_datas != []:
-                per_mesh_data = per_mesh_datas[0]
-            obj = self._create_section(section, per_mesh_data)
-            if obj:
-                self._create_normals(section, cast(Mesh, obj.data))
-                objects.append(obj)
+        indices: Iterable[int] = range(len(self.model.sections))
+        if section_filter:
+            indices = sorted(set(section_filter(self.model)))
+        for idx in indices:
+            geometry = get_section_geometry(self.model, self.model_path, idx, self.cache)
+            if geometry is None:
+                continue
+            obj = self._create_section(
+                self.model.sections[idx], geometry, self.model.get_offset(idx)
+            )
+            self._create_normals(geometry, cast(Mesh, obj.data))
+            objects.append(obj)
         return objects
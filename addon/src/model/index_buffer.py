@@ -1,12 +1,18 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
+import numpy as np
+import numpy.typing as npt
+
 from enum import IntEnum
-from io import BufferedReader
 
+from .reader import ModelReader
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["IndexBuffer", "IndexBufferType"]
 
+# Index data types by stride
+_DTYPES = {2: "<u2", 4: "<u4"}
+
 
 class IndexBufferType(IntEnum):
     Default = 0
@@ -23,15 +29,25 @@ class IndexBuffer:
         self.index_buffer_type: IndexBufferType = IndexBufferType.Default
         self.stride: int = -1
         self.count: int = 0
-        self.indices: list[int] = []
-
-    def read(self, reader: BufferedReader) -> None:
-        self.index_buffer_type = IndexBufferType(int.from_bytes(reader.read(1), "little"))
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
-        if self.stride % 2 != 0:
-            raise IncorrectStrideValue("Index buffer stride was not a multiple of 2!")
-
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            index = int.from_bytes(reader.read(self.stride), "little")
-            self.indices.append(index)
+        self.indices: npt.NDArray[np.uint16 | np.uint32] = np.empty(0, dtype=np.uint32)
+
+    def read(self, reader: ModelReader) -> None:
+        self.index_buffer_type = IndexBufferType(reader.read_u8())
+        self.stride = reader.read_i8()
+        self.count = reader.read_u32()
+        if self.count == 0:
+            self.indices = np.empty(0, dtype=np.uint32)
+            return
+        dtype = _DTYPES.get(self.stride)
+        if dtype is None:
+            raise IncorrectStrideValue(f"Index buffer stride was {self.stride}, not 2 or 4!")
+        self.indices = reader.read_array(dtype, self.count)
+
+    def scan(self, reader: ModelReader) -> None:
+        """
+        Reads only the type, stride and count of the buffer, skipping over the indices.
+        """
+        self.index_buffer_type = IndexBufferType(reader.read_u8())
+        self.stride = reader.read_i8()
+        self.count = reader.read_u32()
+        reader.skip(self.stride * self.count)
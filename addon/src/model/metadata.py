@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
-
+from .reader import ModelReader
 from .rtgo_offset import RtgoOffset
 from .blendshape_bounding_box_buffer import BlendShapeBoundingBox
 from .section import Section
@@ -10,6 +9,7 @@ from .marker import Marker
 from .bone import Bone
 from .region import Region
 from .header import ModelHeader
+from .geometry import SectionGeometry
 
 __all__ = ["Model"]
 
@@ -25,8 +25,33 @@ class Model:
         self.materials: list[int] = []
         self.sections: list[Section] = []
         self.blendshape_bounding_boxes: list[BlendShapeBoundingBox] = []
+        self.geometry: dict[int, SectionGeometry] = {}
+        self.buffer_size: int = 0
+
+    def read(self, reader: ModelReader) -> None:
+        """
+        Reads the model. Section buffers are decoded lazily, once they are first accessed.
+        """
+        self.buffer_size = len(reader)
+        self._read_metadata(reader)
+        for _ in range(self.header.section_count):
+            section = Section()
+            section.read(reader)
+            self.sections.append(section)
+
+    def read_metadata(self, reader: ModelReader) -> None:
+        """
+        Reads everything except the section buffers, of which only the vertex and index counts
+        are read. This is enough to list regions and permutations, estimate the cost of an
+        import or validate a file, but the sections of the model can not be imported afterwards.
+        """
+        self._read_metadata(reader)
+        for _ in range(self.header.section_count):
+            section = Section()
+            section.scan(reader)
+            self.sections.append(section)
 
-    def read(self, reader: BufferedReader) -> None:
+    def _read_metadata(self, reader: ModelReader) -> None:
         self.header.read(reader)
         for _ in range(self.header.region_count):
             region = Region()
@@ -48,14 +73,48 @@ class Model:
             offset = RtgoOffset()
             offset.read(reader)
             self.offsets.append(offset)
-        for _ in range(self.header.material_count):
-            material = int.from_bytes(reader.read(4), "little", signed=True)
-            self.materials.append(material)
+        self.materials = reader.read_array("<i4", self.header.material_count).tolist()
         for _ in range(self.header.blendshape_bounding_box_count):
             blendshape_bounding_box = BlendShapeBoundingBox()
             blendshape_bounding_box.read(reader)
             self.blendshape_bounding_boxes.append(blendshape_bounding_box)
-        for _ in range(self.header.section_count):
-            section = Section()
-            section.read(reader)
-            self.sections.append(section)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The estimated amount of memory held by the model: the file it reads sections from, and
+        the geometry of the sections that have been imported.
+        """
+        return self.buffer_size + sum(
+            array.nbytes
+            for geometry in self.geometry.values()
+            for array in geometry.arrays().values()
+        )
+
+    @property
+    def vertex_count(self) -> int:
+        return sum(section.vertex_count for section in self.sections)
+
+    @property
+    def triangle_count(self) -> int:
+        return sum(section.triangle_count for section in self.sections)
+
+    def get_offset(self, section_index: int) -> RtgoOffset | None:
+        """
+        Gets the RTGO offset belonging to the section at the given index, if there is one.
+        """
+        for offset in self.offsets:
+            if offset.mesh_index == section_index:
+                return offset
+        return None
+
+    def get_section_names(self, section_index: int) -> tuple[int, int]:
+        """
+        Gets the region and permutation name of the section at the given index.
+        For RTGOs, the name of the section's offset takes the place of the permutation name.
+        """
+        section = self.sections[section_index]
+        offset = self.get_offset(section_index)
+        if offset:
+            return section.region_name, offset.name
+        return section.region_name, section.permutation_name
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+from collections import OrderedDict
+from pathlib import Path
+
+from .metadata import Model
+from .reader import ModelReader
+
+__all__ = ["ModelCache", "model_cache"]
+
+
+class ModelCache:
+    """
+    Least recently used cache of parsed models, shared by every importer in the process.
+
+    Models are keyed by their path and modification time, so a model that changed on disk is
+    parsed again. Once the estimated size of the cached models exceeds the budget, the least
+    recently used ones are evicted. Model files are read into memory rather than mapped, so
+    cached models do not keep their files open.
+    """
+
+    def __init__(self, budget: int = 512 * 1024 * 1024) -> None:
+        self.budget: int = budget
+        self.hits: int = 0
+        self.misses: int = 0
+        self._models: OrderedDict[tuple[str, int], Model] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def get(self, model_path: str | Path) -> Model:
+        """
+        Gets the parsed model at the given path, parsing it if it is not cached yet.
+
+        Args:
+        - model_path: The path to the model file.
+
+        Returns:
+        - The parsed model. It is shared between callers and must not be modified.
+
+        Raises:
+        - OSError: If the model file can not be read.
+        """
+        key = self._key(model_path)
+        model = self._models.get(key)
+        if model:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return model
+        self.misses += 1
+        for stale in [other for other in self._models if other[0] == key[0]]:
+            del self._models[stale]
+        model = Model()
+        model.read(ModelReader.read_file(model_path))
+        self.put(key, model)
+        return model
+
+    def put(self, key: tuple[str, int], model: Model) -> None:
+        """
+        Adds a parsed model to the cache, evicting older models if it goes over the budget.
+        """
+        self._models[key] = model
+        self._models.move_to_end(key)
+        self.evict(keep=key)
+
+    def evict(self, keep: tuple[str, int] | None = None) -> None:
+        """
+        Evicts the least recently used models until the cache fits in its budget.
+
+        Args:
+        - keep: Optional key of a model that must stay cached.
+        """
+        size = self.size
+        for key in list(self._models):
+            if size <= self.budget:
+                break
+            if key == keep:
+                continue
+            size -= self._models.pop(key).nbytes
+
+    def clear(self) -> None:
+        self._models.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        """
+        The estimated amount of memory held by the cached models, in bytes.
+        """
+        return sum(model.nbytes for model in self._models.values())
+
+    @staticmethod
+    def _key(model_path: str | Path) -> tuple[str, int]:
+        path = Path(model_path).resolve()
+        return str(path), path.stat().st_mtime_ns
+
+
+model_cache = ModelCache()
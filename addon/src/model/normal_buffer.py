@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
-from .vectors import NormalizedVector1010102PackedAsUnorm
+from .reader import ModelReader
+from .vectors import NormalizedVector1010102PackedAsUnorm, unpack_unorm1010102
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["NormalBuffer"]
@@ -12,14 +14,24 @@ class NormalBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.normals: list[NormalizedVector1010102PackedAsUnorm] = []
+        self.data: npt.NDArray[np.uint32] = np.empty(0, dtype=np.uint32)
+        self.normals: npt.NDArray[np.float32] = np.empty((0, 4), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Normal buffer stride was not 4!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            normal = NormalizedVector1010102PackedAsUnorm()
-            normal.read(reader)
-            self.normals.append(normal)
+        self.count = reader.read_u32()
+        self.data = reader.read_array("<u4", self.count)
+        self.normals = unpack_unorm1010102(self.data)
+
+    def vectors(self) -> list[NormalizedVector1010102PackedAsUnorm]:
+        """
+        Creates a vector object per normal. Prefer `normals` unless per-vertex objects are needed.
+        """
+        vectors: list[NormalizedVector1010102PackedAsUnorm] = []
+        for x, y, z, w in self.normals.tolist():
+            vector = NormalizedVector1010102PackedAsUnorm()
+            vector.x, vector.y, vector.z, vector.w = x, y, z, w
+            vectors.append(vector)
+        return vectors
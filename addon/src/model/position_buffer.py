@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
-from .vectors import NormalizedVector4
+from .reader import ModelReader
+from .vectors import NormalizedVector4, unpack_unorm16
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["PositionBuffer"]
@@ -12,14 +14,24 @@ class PositionBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.positions: list[NormalizedVector4] = []
+        self.data: npt.NDArray[np.uint16] = np.empty((0, 4), dtype=np.uint16)
+        self.positions: npt.NDArray[np.float32] = np.empty((0, 4), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 8:
             raise IncorrectStrideValue("Position buffer stride was not 8!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            position = NormalizedVector4()
-            position.read(reader)
-            self.positions.append(position)
+        self.count = reader.read_u32()
+        self.data = reader.read_array("<u2", self.count * 4).reshape(self.count, 4)
+        self.positions = unpack_unorm16(self.data)
+
+    def vectors(self) -> list[NormalizedVector4]:
+        """
+        Creates a vector object per position. Prefer `positions` unless per-vertex objects are needed.
+        """
+        vectors: list[NormalizedVector4] = []
+        for x, y, z, w in self.positions.tolist():
+            vector = NormalizedVector4()
+            vector.x, vector.y, vector.z, vector.w = x, y, z, w
+            vectors.append(vector)
+        return vectors
@@ -0,0 +1,125 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import logging
+import multiprocessing
+import os
+import runpy
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from .geometry import SectionGeometry
+from .geometry_cache import GeometryCache, get_section_geometry
+from .metadata import Model
+from .model_cache import model_cache
+from .reader import ModelReader
+
+__all__ = ["decode_sections", "prefetch_models"]
+
+logger = logging.getLogger(__name__)
+
+PackedGeometry = dict[int, dict[str, npt.NDArray[np.generic]]]
+
+_MIN_JOBS = 4
+
+
+def decode_sections(
+    model_path: str, indices: list[int], cache_folder: str | None = None
+) -> PackedGeometry:
+    """
+    Decodes the geometry of the given sections of a model. Runs in the worker processes.
+
+    Args:
+    - model_path: The path to the model file.
+    - indices: The indices of the sections to decode.
+    - cache_folder: Optional geometry cache folder to load from and store to.
+
+    Returns:
+    - The geometry arrays of each section by section index.
+    """
+    model = Model()
+    with ModelReader.open(model_path) as reader:
+        model.read(reader)
+    cache = GeometryCache(cache_folder) if cache_folder else None
+    packed: PackedGeometry = {}
+    for idx in indices:
+        geometry = get_section_geometry(model, model_path, idx, cache)
+        if geometry:
+            packed[idx] = geometry.arrays()
+    return packed
+
+
+def prefetch_models(
+    requests: Iterable[tuple[str, Callable[[Model], Iterable[int]] | None]],
+    cache_folder: Path | None = None,
+    max_workers: int | None = None,
+) -> None:
+    """
+    Decodes the geometry of many models in a process pool ahead of importing them. The models are
+    parsed into the model cache and receive the decoded geometry, so importing them afterwards
+    only has to create the meshes. Anything that fails to decode is left to the importer.
+
+    Args:
+    - requests: Pairs of model paths and optional section filters, as passed to the importer.
+    - cache_folder: Optional geometry cache folder for the workers to load from and store to.
+    - max_workers: The amount of worker processes, defaults to the amount of CPUs.
+    """
+    selected: dict[str, tuple[Model, set[int]]] = {}
+    for model_path, section_filter in requests:
+        if model_path not in selected:
+            if not Path(model_path).is_file():
+                continue
+            try:
+                selected[model_path] = (model_cache.get(model_path), set())
+            except OSError as e:
+                logger.warning(f"Failed to read model {model_path}: {e}")
+                continue
+        model, indices = selected[model_path]
+        if section_filter:
+            indices.update(section_filter(model))
+        else:
+            indices.update(range(len(model.sections)))
+
+    jobs: list[tuple[Model, str, list[int]]] = []
+    for model_path, (model, indices) in selected.items():
+        missing = sorted(idx for idx in indices if idx not in model.geometry)
+        if len(model.bounding_boxes) > 0 and len(missing) > 0:
+            jobs.append((model, model_path, missing))
+    if len(jobs) < _MIN_JOBS:
+        return
+
+    package_name = __name__.split(".src")[0]
+    package_path = Path(__file__).parents[2]
+    bootstrap = Path(__file__).with_name("worker_bootstrap.py")
+    folder = str(cache_folder) if cache_folder else None
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers or os.cpu_count() or 1, len(jobs)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=runpy.run_path,
+            initargs=(
+                str(bootstrap),
+                {"package_name": package_name, "package_path": str(package_path)},
+                "__ekur_worker__",
+            ),
+        ) as executor:
+            futures: dict[Future[PackedGeometry], Model] = {
+                executor.submit(decode_sections, model_path, indices, folder): model
+                for model, model_path, indices in jobs
+            }
+            for future in as_completed(futures):
+                model = futures[future]
+                try:
+                    packed = future.result()
+                except Exception as e:  # noqa: BLE001
+                    # A corrupt model can fail in any way, the importer decodes it serially instead
+                    logger.warning(f"Failed to decode model {model.header.tag_id}: {e}")
+                    continue
+                for idx, arrays in packed.items():
+                    _ = model.geometry.setdefault(idx, SectionGeometry.from_arrays(arrays))
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning(f"Parallel model decoding failed, decoding on import instead: {e}")
@@ -0,0 +1,161 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import mmap
+import os
+import struct
+import numpy as np
+import numpy.typing as npt
+
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self, cast
+
+__all__ = ["ModelReader"]
+
+_U8 = struct.Struct("<B")
+_I8 = struct.Struct("<b")
+_U16 = struct.Struct("<H")
+_I16 = struct.Struct("<h")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_F32 = struct.Struct("<f")
+
+
+class ModelReader:
+    """
+    Little-endian reader over an in-memory or memory-mapped model file.
+
+    Fields are unpacked in place with precompiled structs at a tracked offset, and bulk reads
+    return views into the underlying buffer rather than copies.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | mmap.mmap | memoryview) -> None:
+        self._buffer: bytes | bytearray | mmap.mmap | memoryview = buffer
+        self._view: memoryview = memoryview(buffer)
+        self.offset: int = 0
+
+    @classmethod
+    def open(cls, path: str | Path) -> Self:
+        """
+        Memory-maps the file at the given path for reading.
+
+        Args:
+        - path: The path to the file.
+
+        Returns:
+        - A reader positioned at the start of the file.
+        """
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(b"")
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    @classmethod
+    def read_file(cls, path: str | Path) -> Self:
+        """
+        Reads the whole file at the given path into memory. Unlike `open`, the file is closed
+        right away, so readers that are kept around do not hold on to a file handle.
+
+        Args:
+        - path: The path to the file.
+
+        Returns:
+        - A reader positioned at the start of the file.
+        """
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def close(self) -> None:
+        """
+        Releases the mapping. Views handed out by `read` and `read_array` keep it alive until
+        they are garbage collected, so closing never invalidates data that is still in use.
+        """
+        try:
+            self._view.release()
+            if isinstance(self._buffer, mmap.mmap):
+                self._buffer.close()
+        except BufferError:
+            pass
+
+    def fork(self, offset: int) -> Self:
+        """
+        Creates an independent reader over the same buffer, positioned at the given offset.
+        """
+        reader = type(self)(self._view)
+        reader.offset = offset
+        return reader
+
+    def tell(self) -> int:
+        return self.offset
+
+    def seek(self, offset: int) -> None:
+        self.offset = offset
+
+    def skip(self, size: int) -> None:
+        self.offset += size
+
+    def read(self, size: int) -> memoryview:
+        """
+        Reads the given amount of bytes as a view into the buffer, without copying.
+        """
+        view = self._view[self.offset : self.offset + size]
+        if len(view) != size:
+            raise EOFError(f"Tried to read {size} bytes at offset {self.offset}, past the end!")
+        self.offset += size
+        return view
+
+    def unpack(self, layout: struct.Struct) -> tuple[Any, ...]:  # pyright: ignore[reportExplicitAny]
+        """
+        Unpacks a precompiled struct layout at the current offset.
+        """
+        values = layout.unpack_from(self._view, self.offset)
+        self.offset += layout.size
+        return values
+
+    def read_u8(self) -> int:
+        return cast(int, self.unpack(_U8)[0])
+
+    def read_i8(self) -> int:
+        return cast(int, self.unpack(_I8)[0])
+
+    def read_u16(self) -> int:
+        return cast(int, self.unpack(_U16)[0])
+
+    def read_i16(self) -> int:
+        return cast(int, self.unpack(_I16)[0])
+
+    def read_u32(self) -> int:
+        return cast(int, self.unpack(_U32)[0])
+
+    def read_i32(self) -> int:
+        return cast(int, self.unpack(_I32)[0])
+
+    def read_f32(self) -> float:
+        return cast(float, self.unpack(_F32)[0])
+
+    def read_bool(self) -> bool:
+        return bool(self.read_u8())
+
+    def read_string(self, length: int) -> str:
+        return str(self.read(length), "utf-8")
+
+    def read_array(self, dtype: npt.DTypeLike, count: int) -> npt.NDArray[Any]:  # pyright: ignore[reportExplicitAny]
+        """
+        Reads `count` elements of the given type as an array viewing the buffer, without copying.
+        """
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.read(count * dtype.itemsize), dtype=dtype)
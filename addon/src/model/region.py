@@ -1,9 +1,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import struct
+
+from .reader import ModelReader
 
 __all__ = ["Permutation"]
 
+_PERMUTATION = struct.Struct("<iHH")
+
 
 class Permutation:
     def __init__(self) -> None:
@@ -11,10 +15,8 @@ class Permutation:
         self.section_count: int = 0
         self.section_index: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.section_count = int.from_bytes(reader.read(2), "little")
-        self.section_index = int.from_bytes(reader.read(2), "little")
+    def read(self, reader: ModelReader) -> None:
+        self.name, self.section_count, self.section_index = reader.unpack(_PERMUTATION)
 
 
 class Region:
@@ -23,9 +25,9 @@ class Region:
         self.permutation_count: int = 0
         self.permutations: list[Permutation] = []
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.permutation_count = int.from_bytes(reader.read(4), "little")
+    def read(self, reader: ModelReader) -> None:
+        self.name = reader.read_i32()
+        self.permutation_count = reader.read_u32()
         for _ in range(self.permutation_count):
             permutation = Permutation()
             permutation.read(reader)
@@ -1,7 +1,6 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
-
+from .reader import ModelReader
 from .vectors import Vector3
 
 __all__ = ["RtgoOffset"]
@@ -13,7 +12,7 @@ class RtgoOffset:
         self.mesh_index: int = 0
         self.position: Vector3 = Vector3()
 
-    def read(self, reader: BufferedReader) -> None:
-        self.name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.mesh_index = int.from_bytes(reader.read(2), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.name = reader.read_i32()
+        self.mesh_index = reader.read_i16()
         self.position.read(reader)
@@ -1,15 +1,18 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import struct
 
 from .buffer_flags import BufferFlags
 from .vertex_buffer import VertexBuffers
 from .vertex_type import VertexType
 from .index_buffer import IndexBuffer
 from .submesh import Submesh
+from .reader import ModelReader
 
 __all__ = ["Section"]
 
+_HEADER = struct.Struct("<iiIBB?")
+
 
 class Section:
     def __init__(self) -> None:
@@ -20,21 +23,77 @@ class Section:
         self.vertex_type: VertexType = VertexType.World
         self.use_dual_quat: bool = False
         self.submeshes: list[Submesh] = []
-        self.index_buffer: IndexBuffer = IndexBuffer()
         self.vertex_flags: BufferFlags = BufferFlags()
-        self.vertex_buffer: VertexBuffers = VertexBuffers()
-
-    def read(self, reader: BufferedReader) -> None:
-        self.region_name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.permutation_name = int.from_bytes(reader.read(4), "little", signed=True)
-        self.submesh_count = int.from_bytes(reader.read(4), "little")
-        self.node_index = int.from_bytes(reader.read(1), "little", signed=False)
-        self.vertex_type = VertexType(int.from_bytes(reader.read(1), "little"))
-        self.use_dual_quat = bool(int.from_bytes(reader.read(1), "little"))
+        self.buffer_offset: int = -1
+        self.is_decoded: bool = False
+        self._reader: ModelReader | None = None
+        self._index_buffer: IndexBuffer = IndexBuffer()
+        self._vertex_buffer: VertexBuffers = VertexBuffers()
+
+    def read(self, reader: ModelReader) -> None:
+        """
+        Reads the section header and records where its buffers are stored, skipping over them.
+        The buffers are only decoded once `index_buffer` or `vertex_buffer` is first accessed.
+        The section keeps its own view of the file, so the reader may be closed in the meantime.
+        """
+        self._reader = reader.fork(reader.tell())
+        self.scan(reader)
+        self._reader.seek(self.buffer_offset)
+
+    def scan(self, reader: ModelReader) -> None:
+        """
+        Reads the section header and the counts stored before each buffer, skipping over the
+        buffer contents. Sections that were only scanned can not be decoded later on.
+        """
+        (
+            self.region_name,
+            self.permutation_name,
+            self.submesh_count,
+            self.node_index,
+            vertex_type,
+            self.use_dual_quat,
+        ) = reader.unpack(_HEADER)
+        self.vertex_type = VertexType(vertex_type)
         for _ in range(self.submesh_count):
             submesh = Submesh()
             submesh.read(reader)
             self.submeshes.append(submesh)
-        self.index_buffer.read(reader)
+        self.buffer_offset = reader.tell()
+        self._index_buffer.scan(reader)
+        self.vertex_flags.read(reader)
+        self._vertex_buffer.scan(reader, self.vertex_flags)
+
+    def decode(self) -> None:
+        """
+        Decodes the index and vertex buffers of the section, if that has not happened yet.
+        """
+        if self.is_decoded or self._reader is None:
+            return
+        reader = self._reader
+        self._index_buffer.read(reader)
         self.vertex_flags.read(reader)
-        self.vertex_buffer.read(reader, self.vertex_flags)
+        self._vertex_buffer.read(reader, self.vertex_flags)
+        self._reader = None
+        self.is_decoded = True
+
+    @property
+    def index_buffer(self) -> IndexBuffer:
+        self.decode()
+        return self._index_buffer
+
+    @property
+    def vertex_buffer(self) -> VertexBuffers:
+        self.decode()
+        return self._vertex_buffer
+
+    @property
+    def index_count(self) -> int:
+        return self._index_buffer.count
+
+    @property
+    def triangle_count(self) -> int:
+        return self._index_buffer.count // 3
+
+    @property
+    def vertex_count(self) -> int:
+        return self._vertex_buffer.position_buffer.count
@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
-from .vectors import NormalizedVector2
+from .reader import ModelReader
+from .vectors import NormalizedVector2, unpack_unorm16
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["UVBuffer"]
@@ -12,14 +14,24 @@ class UVBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.uv: list[NormalizedVector2] = []
+        self.data: npt.NDArray[np.uint16] = np.empty((0, 2), dtype=np.uint16)
+        self.uv: npt.NDArray[np.float32] = np.empty((0, 2), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("UV buffer stride was not 4!")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            uv = NormalizedVector2()
-            uv.read(reader)
-            self.uv.append(uv)
+        self.count = reader.read_u32()
+        self.data = reader.read_array("<u2", self.count * 2).reshape(self.count, 2)
+        self.uv = unpack_unorm16(self.data)
+
+    def vectors(self) -> list[NormalizedVector2]:
+        """
+        Creates a vector object per UV coordinate. Prefer `uv` unless per-vertex objects are needed.
+        """
+        vectors: list[NormalizedVector2] = []
+        for x, y in self.uv.tolist():
+            vector = NormalizedVector2()
+            vector.x, vector.y = x, y
+            vectors.append(vector)
+        return vectors
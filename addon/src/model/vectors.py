@@ -1,10 +1,12 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
 import struct
+import numpy as np
+import numpy.typing as npt
 
-from io import BufferedReader
 from typing import cast
-from mathutils import Matrix, Vector
+
+from .reader import ModelReader
 
 __all__ = [
     "Vector4",
@@ -16,8 +18,68 @@ __all__ = [
     "ByteVector4",
     "Bounds",
     "NormalizedVector1010102PackedAsUnorm",
+    "unpack_unorm16",
+    "unpack_unorm101010",
+    "unpack_unorm1010102",
 ]
 
+_VECTOR4 = struct.Struct("<4f")
+_VECTOR3 = struct.Struct("<3f")
+_BOUNDS = struct.Struct("<2f")
+_UNORM16_VECTOR4 = struct.Struct("<4H")
+_UNORM16_VECTOR2 = struct.Struct("<2H")
+_BYTE_VECTOR4 = struct.Struct("<4B")
+
+
+def unpack_unorm16(packed: npt.NDArray[np.uint16]) -> npt.NDArray[np.float32]:
+    """
+    Converts an array of 16-bit unsigned normalized integers to floats in the range [0, 1].
+
+    Args:
+    - packed: The packed values, of any shape.
+
+    Returns:
+    - The unpacked values, in the same shape.
+    """
+    return packed.astype(np.float32) / np.float32(65535.0)
+
+
+def unpack_unorm101010(packed: npt.NDArray[np.uint32]) -> npt.NDArray[np.float32]:
+    """
+    Unpacks 10:10:10 normalized vectors into floats in the range [0, 1].
+
+    Args:
+    - packed: One packed 32-bit value per vector.
+
+    Returns:
+    - A (count, 3) array of unpacked vectors.
+    """
+    shifts = np.array((0, 10, 20), dtype=np.uint32)
+    unpacked = (packed[:, np.newaxis] >> shifts) & np.uint32(0x3FF)
+    return unpacked.astype(np.float32) / np.float32(1023.0)
+
+
+def unpack_unorm1010102(packed: npt.NDArray[np.uint32]) -> npt.NDArray[np.float32]:
+    """
+    Unpacks 10:10:10:2 normalized vectors into floats in the range [-1, 1], normalising each
+    vector over all four components.
+
+    Args:
+    - packed: One packed 32-bit value per vector.
+
+    Returns:
+    - A (count, 4) array of unpacked vectors.
+    """
+    shifts = np.array((0, 10, 20, 30), dtype=np.uint32)
+    masks = np.array((0x3FF, 0x3FF, 0x3FF, 0x3), dtype=np.uint32)
+    maxima = np.array((1023.0, 1023.0, 1023.0, 3.0), dtype=np.float32)
+    unpacked = ((packed[:, np.newaxis] >> shifts) & masks).astype(np.float32)
+    unpacked = unpacked / maxima * np.float32(2.0) - np.float32(1.0)
+
+    length_sq = np.einsum("ij,ij->i", unpacked, unpacked)
+    length = np.where(np.abs(length_sq) > 1e-6, np.sqrt(length_sq), np.float32(1.0))
+    return unpacked / length[:, np.newaxis]
+
 
 class Vector4:
     def __init__(self) -> None:
@@ -26,15 +88,11 @@ class Vector4:
         self.z: float = 0.0
         self.w: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = struct.unpack("f", reader.read(4))[0]
-        self.y = struct.unpack("f", reader.read(4))[0]
-        self.z = struct.unpack("f", reader.read(4))[0]
-        self.w = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: ModelReader) -> None:
+        self.x, self.y, self.z, self.w = reader.unpack(_VECTOR4)
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z, self.w))
+    def to_tuple(self) -> tuple[float, float, float, float]:
+        return (self.x, self.y, self.z, self.w)
 
 
 class NormalizedVector4:
@@ -44,19 +102,15 @@ class NormalizedVector4:
         self.z: float = 0.0
         self.w: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
-        z = int.from_bytes(reader.read(2), "little")
-        w = int.from_bytes(reader.read(2), "little")
+    def read(self, reader: ModelReader) -> None:
+        x, y, z, w = cast(tuple[int, int, int, int], reader.unpack(_UNORM16_VECTOR4))
         self.x = x / 65535.0
         self.y = y / 65535.0
         self.z = z / 65535.0
         self.w = w / 65535.0
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    def to_tuple(self) -> tuple[float, float, float]:
+        return (self.x, self.y, self.z)
 
 
 class Matrix4x4:
@@ -66,22 +120,14 @@ class Matrix4x4:
         self.m3: Vector4 = Vector4()
         self.m4: Vector4 = Vector4()
 
-    def read(self, reader: BufferedReader) -> None:
+    def read(self, reader: ModelReader) -> None:
         self.m1.read(reader)
         self.m2.read(reader)
         self.m3.read(reader)
         self.m4.read(reader)
 
-    @property
-    def matrix(self) -> Matrix:
-        return Matrix(
-            (
-                self.m1.vector.to_tuple(),
-                self.m2.vector.to_tuple(),
-                self.m3.vector.to_tuple(),
-                self.m4.vector.to_tuple(),
-            )
-        )
+    def to_tuple(self) -> tuple[tuple[float, float, float, float], ...]:
+        return (self.m1.to_tuple(), self.m2.to_tuple(), self.m3.to_tuple(), self.m4.to_tuple())
 
 
 class Vector3:
@@ -90,14 +136,11 @@ class Vector3:
         self.y: float = 0.0
         self.z: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = struct.unpack("f", reader.read(4))[0]
-        self.y = struct.unpack("f", reader.read(4))[0]
-        self.z = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: ModelReader) -> None:
+        self.x, self.y, self.z = reader.unpack(_VECTOR3)
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    def to_tuple(self) -> tuple[float, float, float]:
+        return (self.x, self.y, self.z)
 
 
 class WordVector3DNormalizedWith4Word:
@@ -107,18 +150,14 @@ class WordVector3DNormalizedWith4Word:
         self.z: float = 0.0
         self.index: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
-        z = int.from_bytes(reader.read(2), "little")
-        self.index = int.from_bytes(reader.read(2), "little")
+    def read(self, reader: ModelReader) -> None:
+        x, y, z, self.index = cast(tuple[int, int, int, int], reader.unpack(_UNORM16_VECTOR4))
         self.x = x / 65535.0
         self.y = y / 65535.0
         self.z = z / 65535.0
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    def to_tuple(self) -> tuple[float, float, float]:
+        return (self.x, self.y, self.z)
 
 
 class NormalizedVector2:
@@ -126,15 +165,13 @@ class NormalizedVector2:
         self.x: float = 0.0
         self.y: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        x = int.from_bytes(reader.read(2), "little")
-        y = int.from_bytes(reader.read(2), "little")
+    def read(self, reader: ModelReader) -> None:
+        x, y = cast(tuple[int, int], reader.unpack(_UNORM16_VECTOR2))
         self.x = x / 65535.0
         self.y = y / 65535.0
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y))
+    def to_tuple(self) -> tuple[float, float]:
+        return (self.x, self.y)
 
 
 class NormalizedVector101010:
@@ -143,15 +180,14 @@ class NormalizedVector101010:
         self.y: float = 0.0
         self.z: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        val = int.from_bytes(reader.read(4), "little")
+    def read(self, reader: ModelReader) -> None:
+        val = reader.read_u32()
         self.x = (val & 0x3FF) / 1023.0
         self.y = (val >> 10 & 0x3FF) / 1023.0
         self.z = (val >> 20 & 0x3FF) / 1023.0
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    def to_tuple(self) -> tuple[float, float, float]:
+        return (self.x, self.y, self.z)
 
 
 class ByteVector4:
@@ -161,15 +197,11 @@ class ByteVector4:
         self.z: int = 0
         self.w: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = int.from_bytes(reader.read(1))
-        self.y = int.from_bytes(reader.read(1))
-        self.z = int.from_bytes(reader.read(1))
-        self.w = int.from_bytes(reader.read(1))
+    def read(self, reader: ModelReader) -> None:
+        self.x, self.y, self.z, self.w = reader.unpack(_BYTE_VECTOR4)
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z, self.w))
+    def to_tuple(self) -> tuple[int, int, int, int]:
+        return (self.x, self.y, self.z, self.w)
 
 
 class ShortVector4:
@@ -179,15 +211,11 @@ class ShortVector4:
         self.z: int = 0
         self.w: int = 0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.x = int.from_bytes(reader.read(2), byteorder="little")
-        self.y = int.from_bytes(reader.read(2), byteorder="little")
-        self.z = int.from_bytes(reader.read(2), byteorder="little")
-        self.w = int.from_bytes(reader.read(2), byteorder="little")
+    def read(self, reader: ModelReader) -> None:
+        self.x, self.y, self.z, self.w = reader.unpack(_UNORM16_VECTOR4)
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z, self.w))
+    def to_tuple(self) -> tuple[int, int, int, int]:
+        return (self.x, self.y, self.z, self.w)
 
 
 class Bounds:
@@ -195,9 +223,8 @@ class Bounds:
         self.min: float = 0.0
         self.max: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        self.min = struct.unpack("f", reader.read(4))[0]
-        self.max = struct.unpack("f", reader.read(4))[0]
+    def read(self, reader: ModelReader) -> None:
+        self.min, self.max = reader.unpack(_BOUNDS)
 
 
 class NormalizedVector1010102PackedAsUnorm:
@@ -207,8 +234,8 @@ class NormalizedVector1010102PackedAsUnorm:
         self.z: float = 0.0
         self.w: float = 0.0
 
-    def read(self, reader: BufferedReader) -> None:
-        packed = int.from_bytes(reader.read(4), "little")
+    def read(self, reader: ModelReader) -> None:
+        packed = reader.read_u32()
 
         max_10_bit = (1 << 10) - 1  # 1023
         max_2_bit = (1 << 2) - 1  # 3
@@ -226,6 +253,5 @@ class NormalizedVector1010102PackedAsUnorm:
             self.z /= length
             self.w /= length
 
-    @property
-    def vector(self) -> Vector:
-        return Vector((self.x, self.y, self.z))
+    def to_tuple(self) -> tuple[float, float, float]:
+        return (self.x, self.y, self.z)
@@ -1,8 +1,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from collections.abc import Iterable, Iterator
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
+from .reader import ModelReader
 from .blendshape_index_buffer import BlendShapeIndexBuffer
 from .blendshape_position_buffer import BlendShapePositionBuffer
 from .vertex_type import VertexType
@@ -17,6 +18,18 @@ from .position_buffer import PositionBuffer
 
 __all__ = ["VertexBuffers"]
 
+VertexBuffer = (
+    PositionBuffer
+    | UVBuffer
+    | NormalBuffer
+    | ColorBuffer
+    | WeightIndexBuffer
+    | WeightBuffer
+    | WeightExtraBuffer
+    | BlendShapeIndexBuffer
+    | BlendShapePositionBuffer
+)
+
 
 class VertexBuffers:
     def __init__(self) -> None:
@@ -33,78 +46,81 @@ class VertexBuffers:
         self.blendshape_index_buffer: BlendShapeIndexBuffer = BlendShapeIndexBuffer()
         self.blendshape_position_buffer: BlendShapePositionBuffer = BlendShapePositionBuffer()
 
-    def read(self, reader: BufferedReader, flags: BufferFlags) -> None:
+    def read(self, reader: ModelReader, flags: BufferFlags) -> None:
         self.flags = flags
-        if flags.has_position:
-            self.position_buffer.read(reader)
-        if flags.has_uv0:
-            self.uv0_buffer.read(reader)
-        if flags.has_uv1:
-            self.uv1_buffer.read(reader)
-        if flags.has_uv2:
-            self.uv2_buffer.read(reader)
-        if flags.has_normal:
-            self.normal_buffer.read(reader)
-        if flags.has_color:
-            self.color_buffer.read(reader)
-        if flags.has_blend_indices:
-            self.weight_index_buffer.read(reader)
-        if flags.has_blend_weights:
-            self.weight_buffer.read(reader)
-        if flags.has_blend_weights_extra:
-            self.weight_extra_buffer.read(reader)
-        if flags.has_blendshape_index:
-            self.blendshape_index_buffer.read(reader)
-        if flags.has_blendshape_position:
-            self.blendshape_position_buffer.read(reader)
+        for buffer in self._present_buffers(flags):
+            buffer.read(reader)
 
-    def enumerate_blendpairs(
-        self, mesh_flags: VertexType
-    ) -> Iterator[tuple[int, Iterable[int], Iterable[float]]]:
+    def scan(self, reader: ModelReader, flags: BufferFlags) -> None:
         """
-        Iterates over all corresponding tuples of (index, blendindices, blendweights).
-        The returned weights will be normalised and all index/weight channels will be accounted for.
+        Reads only the stride and count of every present buffer, skipping over their payloads.
         """
+        self.flags = flags
+        for buffer in self._present_buffers(flags):
+            buffer.stride = reader.read_i8()
+            buffer.count = reader.read_u32()
+            reader.skip(buffer.stride * buffer.count)
 
-        blend_indices = self.weight_index_buffer.indices
+    def _present_buffers(self, flags: BufferFlags) -> list[VertexBuffer]:
+        """
+        Lists the buffers present in the section, in the order they are stored in the file.
+        """
+        buffers: list[tuple[bool, VertexBuffer]] = [
+            (flags.has_position, self.position_buffer),
+            (flags.has_uv0, self.uv0_buffer),
+            (flags.has_uv1, self.uv1_buffer),
+            (flags.has_uv2, self.uv2_buffer),
+            (flags.has_normal, self.normal_buffer),
+            (flags.has_color, self.color_buffer),
+            (flags.has_blend_indices, self.weight_index_buffer),
+            (flags.has_blend_weights, self.weight_buffer),
+            (flags.has_blend_weights_extra, self.weight_extra_buffer),
+            (flags.has_blendshape_index, self.blendshape_index_buffer),
+            (flags.has_blendshape_position, self.blendshape_position_buffer),
+        ]
+        return [buffer for present, buffer in buffers if present]
+
+    def blend_pairs(
+        self, mesh_flags: VertexType
+    ) -> tuple[npt.NDArray[np.int32], npt.NDArray[np.uint16], npt.NDArray[np.float32]]:
+        """
+        Gets the (vertex, bone, weight) triples of all skinned vertices as flat arrays, in vertex
+        order. Weights are normalised per vertex and zero weights are left out. If a vertex lists
+        the same bone more than once, only its last weight is kept, as it would replace the others.
+        """
+        indices = self.weight_index_buffer.indices
+        count = min(len(self.position_buffer.positions), len(indices))
 
         # Determine vertex type
         rigid = len(self.weight_buffer.weights) == 0
         rigid_boned = mesh_flags == VertexType.RigidBoned and not self.flags.has_blend_weights
         implied = mesh_flags != VertexType.Skinned8Weights and self.flags.has_blend_weights
 
-        # Only get blend weights if we're not using rigid or rigid_boned
-        blend_weights = [] if (rigid or rigid_boned) else self.weight_buffer.weights
-
-        for i in range(len(self.position_buffer.positions)):
-            if i >= len(blend_indices):
-                continue
-
-            indices = [int(x) for x in blend_indices[i].vector]
-
-            if rigid or rigid_boned:
-                # For rigid boned, each index keeps its actual bone index value
-                # We assign weight 1.0 to each bone index
-                weights = [1.0] * len(indices)
-            else:
-                # For skinned vertices, get the weights from the buffer
-                if i >= len(blend_weights):
-                    continue
-                weights = blend_weights[i].vector.to_tuple()
-
-                # Append a 1.0 to the end of weights list for implied weights
-                if implied:
-                    weights = [*weights, 1.0]
-
-                # Filter out zero weights and corresponding indices
-                if 0 in weights:
-                    valid_pairs = [(idx, w) for idx, w in zip(indices, weights) if w > 0]
-                    indices = [pair[0] for pair in valid_pairs]
-                    weights = [pair[1] for pair in valid_pairs]
-
-            # Normalize the weights so they all add up to 1
-            weight_sum = sum(weights)
-            if weight_sum > 0:
-                weights = [w / weight_sum for w in weights]
-
-            yield (i, indices, weights)
+        if rigid or rigid_boned:
+            # Rigid vertices are bound to every listed bone with an equal weight
+            weights = np.ones((count, indices.shape[1]), dtype=np.float64)
+        else:
+            weights = self.weight_buffer.weights.astype(np.float64)
+            if implied:
+                # The last weight is implied to complete the sum
+                weights = np.hstack((weights, np.ones((len(weights), 1))))
+            count = min(count, len(weights))
+
+        # Only as many weights as there are indices are used
+        columns = min(indices.shape[1], weights.shape[1])
+        weights = weights[:count, :columns]
+        bones = indices[:count, :columns]
+
+        # Normalize the weights so they all add up to 1
+        totals = weights.sum(axis=1, keepdims=True)
+        weights = np.divide(weights, totals, out=weights, where=totals > 0)
+
+        vertices, used = np.nonzero(weights > 0)
+        bones = bones[vertices, used].astype(np.uint16)
+        weights = weights[vertices, used]
+
+        # Keep the last weight of every (vertex, bone) pair
+        keys = vertices.astype(np.int64) << 16 | bones
+        _, last = np.unique(keys[::-1], return_index=True)
+        keep = np.sort(len(keys) - 1 - last)
+        return vertices[keep].astype(np.int32), bones[keep], weights[keep].astype(np.float32)
@@ -1,8 +1,10 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
-from .vectors import NormalizedVector101010
+from .reader import ModelReader
+from .vectors import NormalizedVector101010, unpack_unorm101010
 from ..exceptions import IncorrectStrideValue
 
 __all__ = ["WeightBuffer"]
@@ -12,14 +14,24 @@ class WeightBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.weights: list[NormalizedVector101010] = []
+        self.data: npt.NDArray[np.uint32] = np.empty(0, dtype=np.uint32)
+        self.weights: npt.NDArray[np.float32] = np.empty((0, 3), dtype=np.float32)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride != 4:
             raise IncorrectStrideValue("Invalid Weight buffer stride")
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            weight = NormalizedVector101010()
-            weight.read(reader)
-            self.weights.append(weight)
+        self.count = reader.read_u32()
+        self.data = reader.read_array("<u4", self.count)
+        self.weights = unpack_unorm101010(self.data)
+
+    def vectors(self) -> list[NormalizedVector101010]:
+        """
+        Creates a vector object per weight. Prefer `weights` unless per-vertex objects are needed.
+        """
+        vectors: list[NormalizedVector101010] = []
+        for x, y, z in self.weights.tolist():
+            vector = NormalizedVector101010()
+            vector.x, vector.y, vector.z = x, y, z
+            vectors.append(vector)
+        return vectors
@@ -1,7 +1,9 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # Copyright © 2025 Surasia
-from io import BufferedReader
+import numpy as np
+import numpy.typing as npt
 
+from .reader import ModelReader
 from .vectors import ByteVector4, ShortVector4
 from ..exceptions import IncorrectStrideValue
 
@@ -12,20 +14,26 @@ class WeightIndexBuffer:
     def __init__(self) -> None:
         self.stride: int = -1
         self.count: int = 0
-        self.indices: list[ByteVector4 | ShortVector4] = []
+        self.indices: npt.NDArray[np.uint8 | np.uint16] = np.empty((0, 4), dtype=np.uint8)
 
-    def read(self, reader: BufferedReader) -> None:
-        self.stride = int.from_bytes(reader.read(1), "little", signed=True)
+    def read(self, reader: ModelReader) -> None:
+        self.stride = reader.read_i8()
         if self.stride % 2 != 0:
             raise IncorrectStrideValue("WeightIndex buffer stride was not a multiple of 2!")
 
-        self.count = int.from_bytes(reader.read(4), "little")
-        for _ in range(self.count):
-            if self.stride == 4:
-                vector = ByteVector4()
-                vector.read(reader)
-                self.indices.append(vector)
-            if self.stride == 8:
-                vector = ShortVector4()
-                vector.read(reader)
-                self.indices.append(vector)
+        self.count = reader.read_u32()
+        if self.stride == 4:
+            self.indices = reader.read_array(np.uint8, self.count * 4).reshape(self.count, 4)
+        if self.stride == 8:
+            self.indices = reader.read_array("<u2", self.count * 4).reshape(self.count, 4)
+
+    def vectors(self) -> list[ByteVector4 | ShortVector4]:
+        """
+        Creates a vector object per set of indices. Prefer `indices` unless per-vertex objects are needed.
+        """
+        vectors: list[ByteVector4 | ShortVector4] = []
+        for x, y, z, w in self.indices.tolist():
+            vector = ByteVector4() if self.stride == 4 else ShortVector4()
+            vector.x, vector.y, vector.z, vector.w = x, y, z, w
+            vectors.append(vector)
+        return vectors
@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+"""
+Makes the model package importable in worker processes, which run without Blender.
+
+This file is run through `runpy.run_path` as the initializer of the prefetch process pool, with
+`package_name` and `package_path` passed as globals. The addon package and its parents are
+registered as bare packages, so importing the parser does not run the addon's `__init__`.
+"""
+
+import sys
+import types
+
+if __name__ == "__ekur_worker__":
+    package_name: str = globals()["package_name"]
+    package_path: str = globals()["package_path"]
+    parts = package_name.split(".")
+    for i in range(len(parts)):
+        name = ".".join(parts[: i + 1])
+        if name in sys.modules:
+            continue
+        package = types.ModuleType(name)
+        package.__path__ = [package_path] if i == len(parts) - 1 else []
+        sys.modules[name] = package
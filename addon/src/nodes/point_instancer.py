@@ -0,0 +1,75 @@
+# SPDX-License-Identifier: GPL-3.0-or-later
+# Copyright © 2025 Surasia
+import bpy
+from bpy.types import (
+    GeometryNodeInputNamedAttribute,
+    GeometryNodeInstanceOnPoints,
+    GeometryNodeObjectInfo,
+    NodeGroupInput,
+    NodeGroupOutput,
+    NodeSocketGeometry,
+    NodeSocketObject,
+    NodeTree,
+)
+
+from ..utils import create_node, create_socket
+
+__all__ = ["ROTATION_ATTRIBUTE", "SCALE_ATTRIBUTE", "PointInstancer"]
+
+ROTATION_ATTRIBUTE = "instance_rotation"
+SCALE_ATTRIBUTE = "instance_scale"
+
+
+class PointInstancer:
+    """
+    Geometry nodes group that instances the geometry of an object on every point of a mesh,
+    rotated and scaled by the quaternion and vector attributes of the points.
+    """
+
+    def __init__(self) -> None:
+        self.node_tree: NodeTree | None = bpy.data.node_groups.get("Point Instancer")
+        if self.node_tree:
+            return
+        else:
+            self.node_tree = bpy.data.node_groups.new(
+                type="GeometryNodeTree", name="Point Instancer"
+            )
+        self.node_tree.is_modifier = True  # pyright: ignore[reportAttributeAccessIssue]
+        self.create_sockets()
+        self.create_nodes()
+
+    def create_sockets(self) -> None:
+        if not self.node_tree:
+            return
+        interface = self.node_tree.interface
+        _ = create_socket(interface, "Geometry", NodeSocketGeometry)
+        _ = create_socket(interface, "Object", NodeSocketObject)
+        _ = create_socket(interface, "Geometry", NodeSocketGeometry, False)
+
+    def create_nodes(self) -> None:
+        if not self.node_tree:
+            return
+        nodes = self.node_tree.nodes
+        output = create_node(nodes, 400, 0, NodeGroupOutput)
+        input = create_node(nodes, -400, 0, NodeGroupInput)
+
+        object_info = create_node(nodes, -180, -60, GeometryNodeObjectInfo)
+        object_info.transform_space = "ORIGINAL"
+
+        rotation = create_node(nodes, -180, -300, GeometryNodeInputNamedAttribute)
+        rotation.data_type = "QUATERNION"
+        rotation.inputs["Name"].default_value = ROTATION_ATTRIBUTE  # pyright: ignore[reportAttributeAccessIssue]
+
+        scale = create_node(nodes, -180, -420, GeometryNodeInputNamedAttribute)
+        scale.data_type = "FLOAT_VECTOR"
+        scale.inputs["Name"].default_value = SCALE_ATTRIBUTE  # pyright: ignore[reportAttributeAccessIssue]
+
+        instance = create_node(nodes, 160, 0, GeometryNodeInstanceOnPoints)
+
+        links = self.node_tree.links
+        _ = links.new(input.outputs[1], object_info.inputs["Object"])
+        _ = links.new(input.outputs[0], instance.inputs["Points"])
+        _ = links.new(object_info.outputs["Geometry"], instance.inputs["Instance"])
+        _ = links.new(rotation.outputs["Attribute"], instance.inputs["Rotation"])
+        _ = links.new(scale.outputs["Attribute"], instance.inputs["Scale"])
+        _ = links.new(instance.outputs["Instances"], output.inputs[0])
@@ -9,7 +9,14 @@ from pathlib import Path
 from typing import final
 from bpy.types import Context, Operator
 
-from ..utils import get_addon_preferences, get_data_folder, get_package_name
+from ..model.geometry_cache import GeometryCache
+from ..model.model_cache import model_cache
+from ..utils import (
+    get_addon_preferences,
+    get_data_folder,
+    get_geometry_cache_folder,
+    get_package_name,
+)
 from ..constants import version_string
 
 
@@ -48,6 +55,9 @@ class DumpFilesOperator(Operator):
         if not ekur_save_path.exists():
             logging.error(f"Ekur was not found at {ekur_save_path}!")
             return {"CANCELLED"}
+        # Cached models keep the files the dumper replaces memory-mapped, so release them first
+        model_cache.clear()
+        GeometryCache(get_geometry_cache_folder()).clear()
         _ = subprocess.run(proc)
         with open(f"{extension_path}/{version_string}", "w") as f:
             _ = f.write(version_string)
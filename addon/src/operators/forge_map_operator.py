@@ -5,6 +5,8 @@ import re
 import urllib.error
 import urllib.request
 import bpy
+import numpy as np
+import numpy.typing as npt
 
 from pathlib import Path
 from typing import final
@@ -15,39 +17,148 @@ from bpy.types import (
     Object,
     Operator,
 )
-from mathutils import Matrix, Quaternion, Vector
 
 from .material_operator import import_materials
 from ..ui.forge_map_options import get_forge_map_options
 from ..ui.material_options import get_material_options
 from ..constants import BLOCKER_MATERIAL, INCORRECT_RTGOS
-from ..model.importer.model_importer import ModelImporter
+from ..model.importer.instancer import PointInstances
+from ..model.importer.model_importer import ModelImporter, SectionFilter, prefetch_imports
+from ..model.metadata import Model
+from ..model.model_cache import model_cache
 from ..json_definitions import ForgeMaterial, ForgeObjectDefinition, ForgeObjectRepresentation
 
-from ..madeleine.forge_level_reader import ForgeFolder, ForgeLevel, get_forge_map
+from ..madeleine.forge_level_reader import (
+    ForgeFolder,
+    ForgeLevel,
+    ForgeObject,
+    get_forge_map_data,
+    iter_forge_map,
+)
 from ..utils import get_data_folder, read_json_file
 
 
-def apply_rtgo_transform(
-    pos: list[float],
-    offset: Vector,
-    scale: list[float],
-    rotation: Quaternion,
-) -> list[float]:
-    scaled_offset = Vector(
+def forge_transforms(
+    objects: list[ForgeObject],
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Computes the transforms of every forge object at once.
+
+    Args:
+    - objects: The forge objects of the map.
+
+    Returns:
+    - The positions, (w, x, y, z) rotation quaternions and scaled rotation matrices of the objects.
+      The scaled rotation matrices map RTGO offsets to their offset from the object position.
+    """
+    positions = np.array([o.position for o in objects], dtype=np.float64).reshape(-1, 3)
+    forward = _normalized(np.array([o.rotation_forward for o in objects], dtype=np.float64))
+    up = _normalized(np.array([o.rotation_up for o in objects], dtype=np.float64))
+    right = _normalized(np.cross(forward.reshape(-1, 3), up.reshape(-1, 3)))
+    rotations = np.stack((forward.reshape(-1, 3), -right, up.reshape(-1, 3)), axis=2)
+    scales = np.array([o.scale for o in objects], dtype=np.float64).reshape(-1, 3)
+    return positions, _matrix_to_quaternion(rotations), rotations * scales[:, np.newaxis, :]
+
+
+def apply_rtgo_offsets(
+    positions: npt.NDArray[np.float64],
+    scaled_rotations: npt.NDArray[np.float64],
+    offsets: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """
+    Moves every position by its RTGO offset, scaled and rotated by the object it belongs to.
+
+    Args:
+    - positions: The (N, 3) positions of the objects.
+    - scaled_rotations: The (N, 3, 3) scaled rotation matrices of the objects.
+    - offsets: The (N, 3) RTGO offsets.
+
+    Returns:
+    - The (N, 3) offset positions.
+    """
+    return positions + np.einsum("nij,nj->ni", scaled_rotations, offsets)
+
+
+def _normalized(vectors: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Normalizes the rows of an array, leaving zero length rows as zero.
+    """
+    vectors = vectors.reshape(-1, 3)
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+
+def _matrix_to_quaternion(matrices: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """
+    Converts (N, 3, 3) rotation matrices to (w, x, y, z) quaternions with a non-negative W.
+    Matrices that are not a rotation, such as ones built from zero length vectors, yield identity.
+    """
+    m = matrices
+    trace = m[:, 0, 0] + m[:, 1, 1] + m[:, 2, 2]
+    candidates = np.stack(
         (
-            offset[0] * scale[0],
-            offset[1] * scale[1],
-            offset[2] * scale[2],
-        )
+            1.0 + trace,
+            1.0 + m[:, 0, 0] - m[:, 1, 1] - m[:, 2, 2],
+            1.0 - m[:, 0, 0] + m[:, 1, 1] - m[:, 2, 2],
+            1.0 - m[:, 0, 0] - m[:, 1, 1] + m[:, 2, 2],
+        ),
+        axis=1,
     )
-    scaled_offset.rotate(rotation)  # pyright: ignore[reportUnknownMemberType]
-    new_axis: list[float] = [
-        pos[0] + scaled_offset[0],
-        pos[1] + scaled_offset[1],
-        pos[2] + scaled_offset[2],
-    ]
-    return new_axis
+    largest = np.argmax(candidates, axis=1)
+    s = 2.0 * np.sqrt(np.maximum(candidates[np.arange(len(m)), largest], 1e-12))
+    differences = (m[:, 2, 1] - m[:, 1, 2], m[:, 0, 2] - m[:, 2, 0], m[:, 1, 0] - m[:, 0, 1])
+    sums = (m[:, 0, 1] + m[:, 1, 0], m[:, 0, 2] + m[:, 2, 0], m[:, 1, 2] + m[:, 2, 1])
+    quaternions = np.stack(
+        (
+            np.choose(largest, (s / 4, differences[0] / s, differences[1] / s, differences[2] / s)),
+            np.choose(largest, (differences[0] / s, s / 4, sums[0] / s, sums[1] / s)),
+            np.choose(largest, (differences[1] / s, sums[0] / s, s / 4, sums[2] / s)),
+            np.choose(largest, (differences[2] / s, sums[1] / s, sums[2] / s, s / 4)),
+        ),
+        axis=1,
+    )
+    quaternions[quaternions[:, 0] < 0] *= -1
+    lengths = np.linalg.norm(quaternions, axis=1, keepdims=True)
+    invalid = ~np.isfinite(lengths[:, 0]) | (lengths[:, 0] < 1e-6)
+    quaternions[invalid] = (1.0, 0.0, 0.0, 0.0)
+    lengths[invalid] = 1.0
+    return quaternions / lengths
+
+
+def variant_filter(variant: int) -> SectionFilter:
+    """
+    Creates a section filter that keeps the sections whose permutation matches the forge variant,
+    falling back to sections whose region matches, and then to every section.
+
+    Args:
+    - variant: The variant (permutation or region name) of the forge object.
+
+    Returns:
+    - The section filter to pass to the model importer.
+    """
+
+    def select(model: Model) -> list[int]:
+        names = [model.get_section_names(idx) for idx in range(len(model.sections))]
+        selected = [idx for idx, (_, permutation) in enumerate(names) if permutation == variant]
+        if len(selected) == 0:
+            selected = [idx for idx, (region, _) in enumerate(names) if region == variant]
+        if len(selected) == 0:
+            selected = list(range(len(names)))
+        return selected
+
+    return select
+
+
+def get_model_path(global_id: str) -> str:
+    """
+    Gets the path to the model of a forge object representation, which is either a regular
+    model or a runtime geometry.
+    """
+    data = get_data_folder()
+    path = f"{data}/models/{global_id}.ekur"
+    if not Path(path).exists():
+        path = f"{data}/runtime_geo/{global_id}.ekur"
+    return path
 
 
 @final
@@ -59,18 +170,24 @@ class ForgeMapOperator(Operator):
     def __init__(self, *args, **kwargs) -> None:  # pyright: ignore[reportMissingParameterType, reportUnknownParameterType]
         super().__init__(*args, **kwargs)
         self._geometry_cache = {}
+        self._representation_cache = {}
+        self._source_cache = {}
 
-    def _get_or_create_geometry(self, global_id: str, style: int) -> list[Object]:
-        if global_id in self._geometry_cache or bpy.context.scene is None:
-            return self._geometry_cache[global_id]
+    def _get_or_create_geometry(self, global_id: str, style: int, variant: int) -> list[Object]:
+        # Keyed by the selected sections, so variants that select the same ones share an import
+        path = get_model_path(global_id)
+        sections: tuple[int, ...] = ()
+        if Path(path).is_file():
+            sections = tuple(variant_filter(variant)(model_cache.get(path)))
+        key = (global_id, sections)
+        if key in self._geometry_cache or bpy.context.scene is None:
+            return self._geometry_cache[key]
 
-        data = get_data_folder()
         props = get_material_options()
-        path = f"{data}/models/{global_id}.ekur"
-        if not Path(path).exists():
-            path = f"{data}/runtime_geo/{global_id}.ekur"
         geo_importer = ModelImporter()
-        imported_objects = geo_importer.start_import(path, bones=False)
+        imported_objects = geo_importer.start_import(
+            path, bones=False, section_filter=lambda _: sections
+        )
 
         master_collection = bpy.data.collections.get("Master Geometries")
         if not master_collection:
@@ -90,7 +207,42 @@ class ForgeMapOperator(Operator):
             import_materials()
             source_object.select_set(False)  # pyright: ignore[reportUnknownMemberType]
 
-        self._geometry_cache[global_id] = source_objects
+        self._geometry_cache[key] = source_objects
+        return source_objects
+
+    def _get_source_objects(
+        self, object: ForgeObject, repres: ForgeObjectRepresentation, remove_blockers: bool
+    ) -> list[Object]:
+        """
+        Gets the imported objects to place for a forge object. Resolved once per global id and
+        variant, and shared by every forge object with the same ones.
+
+        Args:
+        - object: The forge object to get the source objects of.
+        - repres: The representation of the forge object.
+        - remove_blockers: Whether to leave out objects with blocker materials.
+
+        Returns:
+        - The source objects with mesh data, without blockers if they are removed.
+        """
+        key = (object.global_id, object.variant)
+        if key in self._source_cache:
+            return self._source_cache[key]
+        source_objects: list[Object] = []
+        for obj in self._get_or_create_geometry(
+            str(repres["model"]), repres["style"], object.variant
+        ):
+            if remove_blockers and any(
+                m.material and m.material.name in BLOCKER_MATERIAL for m in obj.material_slots
+            ):
+                continue
+            if obj.data is None:
+                continue
+            if type(obj.data) is Mesh and "UV1" in obj.data.uv_layers:
+                obj.data.uv_layers["UV1"].active_render = True
+                obj.data.uv_layers["UV1"].active = True
+            source_objects.append(obj)
+        self._source_cache[key] = source_objects
         return source_objects
 
     def create_categories(
@@ -157,112 +309,117 @@ class ForgeMapOperator(Operator):
             root_folder = [col for col in cats.items()][0]
         return cats, root_folder
 
+    def get_representation(
+        self, object: ForgeObject, definition: ForgeObjectDefinition
+    ) -> ForgeObjectRepresentation | None:
+        key = (object.global_id, object.variant)
+        if key not in self._representation_cache:
+            self._representation_cache[key] = self._resolve_representation(object, definition)
+        return self._representation_cache[key]
+
+    def _resolve_representation(
+        self, object: ForgeObject, definition: ForgeObjectDefinition
+    ) -> ForgeObjectRepresentation | None:
+        object_def = definition["objects"].get(str(object.global_id))
+        if object_def is None:
+            return None
+        non_rtgo = [m for m in object_def["representations"] if not m["is_rtgo"]]
+        matching = [m for m in non_rtgo if m["name_int"] == object.variant]
+        if (object.variant == 0 and len(non_rtgo) > 0) or len(non_rtgo) == 1:
+            return non_rtgo[0]
+        elif len(matching) == 0 and len(non_rtgo) > 1:
+            if object.global_id in INCORRECT_RTGOS:
+                return non_rtgo[0]
+            return non_rtgo[1]
+        elif len(non_rtgo) == 0 and len(object_def["representations"]) != 0:
+            return object_def["representations"][0]
+        elif len(matching) > 0:
+            return matching[0]
+        return None
+
     def execute(self, context: Context | None) -> set[str]:
-        self._geometry_cache: dict[str, list[Object]] = {}
+        self._geometry_cache: dict[tuple[str, tuple[int, ...]], list[Object]] = {}
+        self._representation_cache: dict[tuple[int, int], ForgeObjectRepresentation | None] = {}
+        self._source_cache: dict[tuple[int, int], list[Object]] = {}
         options = get_forge_map_options()
         data = get_data_folder()
-        split = options.url.split("/")
-        asset, version = self.get_asset_version(split)
-        level = get_forge_map(asset, version, options.mvar_file)
         objects_path = Path(f"{data}/forge_objects.json")
         definition = read_json_file(objects_path, ForgeObjectDefinition)
         globals_path = Path(f"{data}/forge_materials.json")
         globals = read_json_file(globals_path, ForgeMaterial)
         if definition is None or context is None or context.scene is None or globals is None:
             return {"CANCELLED"}
+        split = options.url.split("/")
+        asset, version = self.get_asset_version(split)
+        map_data = get_forge_map_data(asset, version, options.mvar_file)
+        if len(map_data) == 0:
+            return {"CANCELLED"}
+
+        # Objects are streamed from the map, only the ones that have a representation are kept
+        level = ForgeLevel()
+        objects: list[ForgeObject] = []
+        representations: list[ForgeObjectRepresentation] = []
+        for item in iter_forge_map(map_data, level):
+            if isinstance(item, ForgeFolder):
+                level.categories.append(item)
+            elif isinstance(item, ForgeObject):
+                repres = self.get_representation(item, definition)
+                if repres:
+                    objects.append(item)
+                    representations.append(repres)
+        del map_data
+
         cats, root_folder = self.create_category(context.scene.collection, level)
-        for object in level.objects:
+        geometries = dict.fromkeys(
+            (str(repres["model"]), object.variant)
+            for object, repres in zip(objects, representations)
+        )
+        prefetch_imports(
+            (get_model_path(model), variant_filter(variant)) for model, variant in geometries
+        )
+        folder_collections: dict[int, Collection] = {}
+        for folder, (collection, children) in cats.items():
+            folder_collections[folder.id] = collection
+            for child, child_collection in children:
+                folder_collections[child.id] = child_collection
+        default_collection = root_folder[1][0] if root_folder else context.scene.collection
+        placements: list[tuple[int, Object, Collection, str]] = []
+        for idx, (object, repres) in enumerate(zip(objects, representations)):
             name: str = ""
             main_collection: Collection | None = None
-            if options.import_folders:
-                for folder, (collection, children) in cats.items():
-                    for obj in folder.objects:
-                        if obj.index == object.index and obj.parent == folder.id:
-                            if obj.name != "":
-                                name = obj.name
-                            main_collection = collection
-                    for child, collection in children:
-                        for obj in child.objects:
-                            if obj.index == object.index and obj.parent == child.id:
-                                if obj.name != "":
-                                    name = obj.name
-                                main_collection = collection
-
-            object_def = definition["objects"].get(str(object.global_id))
-            if object_def is None:
-                continue
-            repres: None | ForgeObjectRepresentation = None
-            non_rtgo = [m for m in object_def["representations"] if not m["is_rtgo"]]
-            matching = [m for m in non_rtgo if m["name_int"] == object.variant]
-            if (object.variant == 0 and len(non_rtgo) > 0) or len(non_rtgo) == 1:
-                repres = non_rtgo[0]
-            elif len(matching) == 0 and len(non_rtgo) > 1:
-                if object.global_id in INCORRECT_RTGOS:
-                    repres = non_rtgo[0]
-                else:
-                    repres = non_rtgo[1]
-            elif len(non_rtgo) == 0 and len(object_def["representations"]) != 0:
-                repres = object_def["representations"][0]
-            elif len(matching) > 0:
-                repres = matching[0]
-            else:
+            if options.import_folders and object.index in level.object_folders:
+                folder_id, name = level.object_folders[object.index]
+                main_collection = folder_collections.get(folder_id)
+
+            if name == "":
+                name = f"[{object.mode.name}] {repres['name']}_instance"
+            for obj in self._get_source_objects(object, repres, options.remove_blockers):
+                placements.append((idx, obj, main_collection or default_collection, name))
+
+        positions, rotations, scaled_rotations = forge_transforms(objects)
+        indices = np.array([idx for idx, _, _, _ in placements], dtype=np.intp)
+        offsets = np.array([obj.location for _, obj, _, _ in placements], dtype=np.float64)
+        locations = apply_rtgo_offsets(
+            positions[indices], scaled_rotations[indices], offsets.reshape(-1, 3)
+        ).tolist()
+        quaternions = rotations.tolist()
+        point_instances = PointInstances()
+        for (idx, obj, collection, name), location in zip(placements, locations):
+            scale = objects[idx].scale
+            if options.use_point_instances:
+                point_instances.add(obj, collection, location, quaternions[idx], scale)
                 continue
-            source_objects = self._get_or_create_geometry(str(repres["model"]), repres["style"])
-            objects = [obj for obj in source_objects if object.variant == obj["permutation_name"]]
-            if len(objects) == 0:
-                objects = [obj for obj in source_objects if object.variant == obj["region_name"]]
-            if len(objects) == 0:
-                objects = source_objects
-            for obj in objects:
-                if options.remove_blockers:
-                    mats = [
-                        m
-                        for m in obj.material_slots
-                        if m.material and m.material.name in BLOCKER_MATERIAL
-                    ]
-                    if len(mats) > 0:
-                        continue
-                if obj.data is None:
-                    continue
-                instance_obj = bpy.data.objects.new(
-                    name=f"[{object.mode.name}] {repres['name']}_instance",
-                    object_data=obj.data.copy(),
-                )
 
-                if name != "":
-                    instance_obj.name = name
-
-                forward = Vector(object.rotation_forward).normalized()
-                up = Vector(object.rotation_up).normalized()
-                right = forward.cross(up)
-                if type(up) is not Vector or type(right) is not Vector:
-                    continue
-                right = right.normalized()
-                rot_matrix = Matrix(
-                    (
-                        (forward[0], -right[0], up[0], 0.0),
-                        (forward[1], -right[1], up[1], 0.0),
-                        (forward[2], -right[2], up[2], 0.0),
-                        (0.0, 0.0, 0.0, 1.0),
-                    )
-                )
-                quat = rot_matrix.to_quaternion()
-                instance_obj.location = Vector(
-                    apply_rtgo_transform(object.position, obj.location, object.scale, quat)
-                )
-                instance_obj.rotation_mode = "QUATERNION"
-                instance_obj.rotation_quaternion = quat
-                instance_obj.scale = object.scale
-                if main_collection:
-                    main_collection.objects.link(instance_obj)  # pyright: ignore[reportUnknownMemberType]
-                elif root_folder:
-                    root_folder[1][0].objects.link(instance_obj)  # pyright: ignore[reportUnknownMemberType]
-                elif bpy.context.scene:
-                    bpy.context.scene.collection.objects.link(instance_obj)  # pyright: ignore[reportUnknownMemberType]
-
-                if type(instance_obj.data) is Mesh and "UV1" in instance_obj.data.uv_layers:
-                    instance_obj.data.uv_layers["UV1"].active_render = True
-                    instance_obj.data.uv_layers["UV1"].active = True
+            instance_obj = bpy.data.objects.new(
+                name=name,
+                object_data=obj.data.copy() if options.copy_meshes else obj.data,
+            )
+            instance_obj.location = location
+            instance_obj.rotation_mode = "QUATERNION"
+            instance_obj.rotation_quaternion = quaternions[idx]
+            instance_obj.scale = scale
+            collection.objects.link(instance_obj)  # pyright: ignore[reportUnknownMemberType]
+        _ = point_instances.create()
         master_collection = bpy.data.collections.get("Master Geometries")
         if master_collection:
             master_collection.hide_viewport = True
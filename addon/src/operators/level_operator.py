@@ -9,7 +9,8 @@ from mathutils import Matrix
 
 from ..ui.level_options import get_level_options
 from ..json_definitions import Level
-from ..model.importer.model_importer import ModelImporter
+from ..model.importer.instancer import PointInstances
+from ..model.importer.model_importer import ModelImporter, prefetch_imports
 from ..utils import get_data_folder, read_json_file
 
 __all__ = ["ImportLevelOperator"]
@@ -67,27 +68,43 @@ class ImportLevelOperator(Operator):
             return {"CANCELLED"}
         data = get_data_folder()
 
+        prefetch_imports(
+            (f"{data}/runtime_geo/{instance['global_id']}.ekur", None)
+            for instance in level["instances"]
+        )
+        point_instances = PointInstances()
         for instance in level["instances"]:
             source_objects = self._get_or_create_geometry(
                 str(instance["global_id"]), data, instance["material"]
             )
+            rotmat = Matrix(
+                (
+                    (instance["forward"][0], instance["left"][0], instance["up"][0], 0.0),
+                    (instance["forward"][1], instance["left"][1], instance["up"][1], 0.0),
+                    (instance["forward"][2], instance["left"][2], instance["up"][2], 0.0),
+                    (0.0, 0.0, 0.0, 1.0),
+                )
+            )
+            rotation = rotmat.to_quaternion()
             for source_object in source_objects:
+                if options.use_point_instances:
+                    point_instances.add(
+                        source_object,
+                        context.collection,
+                        instance["position"],
+                        tuple(rotation),
+                        instance["scale"],
+                    )
+                    continue
                 instance_obj = bpy.data.objects.new(
                     name=f"{source_object.name}_instance", object_data=source_object.data
                 )
-                rotmat = Matrix(
-                    (
-                        (instance["forward"][0], instance["left"][0], instance["up"][0], 0.0),
-                        (instance["forward"][1], instance["left"][1], instance["up"][1], 0.0),
-                        (instance["forward"][2], instance["left"][2], instance["up"][2], 0.0),
-                        (0.0, 0.0, 0.0, 1.0),
-                    )
-                )
                 instance_obj.matrix_world = Matrix.LocRotScale(
-                    instance["position"], rotmat.to_quaternion(), instance["scale"]
+                    instance["position"], rotation, instance["scale"]
                 )
 
                 context.collection.objects.link(instance_obj)  # pyright: ignore[reportUnknownMemberType]
 
+        _ = point_instances.create()
         self._geometry_cache = {}
         return {"FINISHED"}
@@ -3,15 +3,18 @@
 import logging
 import bpy
 
+from collections.abc import Iterator
 from pathlib import Path
 from typing import final
 from bpy.types import Collection, Context, Object, Operator
 
 from ..ui.spartan_options import get_spartan_options
 from ..operators.spartan_online_operator import import_attachments, import_custom_rig
-from ..model.importer.model_importer import ModelImporter
+from ..model.importer.model_importer import ModelImporter, SectionFilter, prefetch_imports
+from ..model.metadata import Model
 from ..json_definitions import (
     CustomizationGlobals,
+    CustomizationPermutation,
     CustomizationRegion,
     CustomizationTheme,
     NameRegion,
@@ -25,6 +28,60 @@ from ..utils import (
 __all__ = ["ImportSpartanOperator"]
 
 
+def theme_permutations(
+    theme: CustomizationTheme,
+) -> Iterator[tuple[CustomizationRegion, list[CustomizationPermutation]]]:
+    """
+    Iterates over the regions of a theme, along with the permutations imported for each of them.
+    Kits only import their first permutation.
+    """
+    for region in theme["regions"] + theme["prosthetics"] + theme["body_types"]:
+        yield region, region["permutations"]
+    for kit in theme["kits"]:
+        for region in kit["regions"]:
+            yield region, region["permutations"][:1]
+
+
+def theme_filter(themes: list[CustomizationTheme]) -> SectionFilter:
+    """
+    Creates a section filter that only keeps the sections used by the regions of the given themes.
+
+    Args:
+    - themes: The customization themes that are going to be imported.
+
+    Returns:
+    - The section filter to pass to the model importer.
+    """
+    used: set[tuple[int, int]] = set()
+    for theme in themes:
+        for region, permutations in theme_permutations(theme):
+            used.update(
+                (perm, permutation["name"])
+                for perm in region["permutation_regions"]
+                for permutation in permutations
+            )
+
+    def select(model: Model) -> list[int]:
+        return [idx for idx in range(len(model.sections)) if model.get_section_names(idx) in used]
+
+    return select
+
+
+def attachment_models(themes: list[CustomizationTheme]) -> set[int]:
+    """
+    Gets the models of every attachment used by the given themes.
+    """
+    models = {attachment["model"] for theme in themes for attachment in theme["attachments"]}
+    for theme in themes:
+        for _, permutations in theme_permutations(theme):
+            models.update(
+                permutation["attachment"]["model"]
+                for permutation in permutations
+                if permutation["attachment"]
+            )
+    return models
+
+
 @final
 class ImportSpartanOperator(Operator):
     bl_idname = "ekur.importspartan"
@@ -54,13 +111,24 @@ class ImportSpartanOperator(Operator):
         if not model_path.exists():
             logging.warning(f"Model path does not exist!: {model_path}")
             return {"CANCELLED"}
-        importer = ModelImporter()
-        rig = import_custom_rig()
-        objects = importer.start_import(str(model_path), custom_rig=rig)
-        global_collection = bpy.data.collections.new("Spartans")
         themes = customization_globals["themes"]
         if options.import_specific_core:
             themes = [theme for theme in themes if theme["name"] == options.core]
+        prefetch_imports(
+            [
+                (str(model_path), theme_filter(themes)),
+                *(
+                    (f"{data_folder}/models/{model}.ekur", None)
+                    for model in attachment_models(themes)
+                ),
+            ]
+        )
+        importer = ModelImporter()
+        rig = import_custom_rig()
+        objects = importer.start_import(
+            str(model_path), custom_rig=rig, section_filter=theme_filter(themes)
+        )
+        global_collection = bpy.data.collections.new("Spartans")
 
         extension_path = bpy.utils.extension_path_user(get_package_name(), create=True)
         names_path = Path(f"{extension_path}/regions_and_permutations.json")
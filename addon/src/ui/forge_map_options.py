@@ -13,6 +13,16 @@ class ForgeMapOptions(PropertyGroup):
     use_file: BoolProperty(name="Use MVAR File", default=False)
     import_folders: BoolProperty(name="Import Folders", default=True)
     remove_blockers: BoolProperty(name="Remove Blockers", default=True)
+    copy_meshes: BoolProperty(
+        name="Copy Meshes",
+        description="Give every placed object its own copy of its mesh, so it can be edited without affecting other objects. Uses a lot more memory.",
+        default=False,
+    )
+    use_point_instances: BoolProperty(
+        name="Instance on Points",
+        description="Place every unique geometry once per folder as a point mesh that instances it with geometry nodes, instead of creating an object per forge object. Much faster for large maps.",
+        default=False,
+    )
     mvar_file: StringProperty(
         name="MVAR File",
         description="Path to .mvar file to import.",
@@ -25,6 +35,8 @@ class ForgeMapOptionsType:
     use_file: bool = False
     import_folders: bool = True
     remove_blockers: bool = True
+    copy_meshes: bool = False
+    use_point_instances: bool = False
     mvar_file: str = ""
 
 
@@ -45,6 +57,8 @@ def draw_forge_map_options(layout: UILayout, props: ForgeMapOptionsType) -> None
         forge_opts.prop(props, "url")
         forge_opts.prop(props, "import_folders")
         forge_opts.prop(props, "remove_blockers")
+        forge_opts.prop(props, "copy_meshes")
+        forge_opts.prop(props, "use_point_instances")
         op = forge_opts.operator("wm.url_open", text="Browse Maps (Cylix)", icon="URL")
         op.url = "https://cylix.guide/discovery/"  # pyright: ignore[reportAttributeAccessIssue]
         op = forge_opts.operator("wm.url_open", text="Browse Maps (Waypoint)", icon="URL")
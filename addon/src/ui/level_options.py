@@ -3,7 +3,7 @@
 # pyright: reportUnknownMemberType=false, reportUninitializedInstanceVariable=false, reportUnknownVariableType=false
 from typing import cast
 import bpy
-from bpy.props import StringProperty
+from bpy.props import BoolProperty, StringProperty
 from bpy.types import PropertyGroup, UILayout
 
 
@@ -14,10 +14,16 @@ class LevelOptions(PropertyGroup):
         description="Path to .json level file to import.",
         subtype="FILE_PATH",
     )
+    use_point_instances: BoolProperty(
+        name="Instance on Points",
+        description="Place every unique geometry once as a point mesh that instances it with geometry nodes, instead of creating an object per placement. Much faster for large levels.",
+        default=False,
+    )
 
 
 class LevelOptionsType:
     level_path: str = ""
+    use_point_instances: bool = False
 
 
 def get_level_options() -> LevelOptionsType:
@@ -35,4 +41,5 @@ def draw_level_options(layout: UILayout, props: LevelOptionsType) -> None:
     if level_body:
         level_opts = level_body.box()
         level_opts.prop(props, "level_path")
+        level_opts.prop(props, "use_point_instances")
         _ = level_body.operator("ekur.importlevel")
@@ -36,7 +36,7 @@ class ModelOptions(PropertyGroup):
     import_vertex_color: BoolProperty(
         name="Import Vertex Color",
         description="Whether to import vertex color as a mesh attribute for models that support it.",
-        default=False,
+        default=True,
     )
     scale_factor: FloatProperty(
         name="Scale Factor",
@@ -56,7 +56,7 @@ class ModelOptionsType:
     import_markers: bool = True
     import_bones: bool = True
     import_collections: bool = True
-    import_vertex_color: bool = False
+    import_vertex_color: bool = True
     scale_factor: float = 1.0
     bone_size: float = 0.03
 
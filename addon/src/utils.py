@@ -35,6 +35,7 @@ __all__ = [
     "create_node",
     "assign_value",
     "get_data_folder",
+    "get_geometry_cache_folder",
     "get_addon_preferences",
     "AddonPreferencesType",
     "create_image",
@@ -156,6 +157,10 @@ class AddonPreferencesType:
     deploy_folder: str = ""
     dump_textures: bool = True
     is_campaign: bool = False
+    use_geometry_cache: bool = False
+    model_cache_budget: int = 512
+    use_parallel_decoding: bool = True
+    validate_meshes: bool = False
 
 
 def get_data_folder() -> str:
@@ -167,6 +172,15 @@ def get_data_folder() -> str:
     return get_addon_preferences().data_folder
 
 
+def get_geometry_cache_folder() -> Path:
+    """Get the folder decoded model geometry is cached in, inside the data folder.
+
+    Returns:
+        The geometry cache folder path.
+    """
+    return Path(get_data_folder()) / "geometry_cache"
+
+
 def get_package_name() -> str:
     if __package__ is None:
         return ""
@@ -0,0 +1,135 @@
+import random
+
+from ..src.madeleine.bond_types import BondType, ForgeObjectMode
+from ..src.madeleine.bond_writer import write_base_struct
+from ..src.madeleine.forge_level_reader import (
+    ForgeFolder,
+    ForgeFolderEntry,
+    ForgeLayer,
+    ForgeLevel,
+    ForgeMat,
+    ForgeObject,
+)
+from ..src.madeleine.forge_level_writer import get_level_struct
+from ..src.madeleine.madeleine import BondValue
+
+
+def _float(rng: random.Random, scale: float) -> float:
+    # Multiples of 1/64 stay exact as 32-bit floats, so levels compare equal after a round trip
+    return rng.randint(-64 * 64, 64 * 64) / 64 * scale
+
+
+def generate_forge_level(
+    objects: int, folders: int = 16, materials: int = 8, seed: int = 0
+) -> ForgeLevel:
+    """
+    Generates a level with random objects, split evenly over top level folders and one subfolder
+    of each folder.
+
+    Args:
+    - objects: Number of objects.
+    - folders: Number of top level folders, at least one.
+    - materials: Number of materials, objects refer to them by index.
+    - seed: Seed of the random values.
+
+    Returns:
+    - Generated level.
+    """
+    rng = random.Random(seed)
+    level = ForgeLevel()
+    level.root_category = 0
+    for id in range(folders):
+        folder = ForgeFolder()
+        folder.id = id
+        folder.name = f"Folder {id}"
+        subfolder = ForgeFolder()
+        subfolder.id = folders + id
+        subfolder.name = f"Subfolder {id}"
+        subfolder.parent = id
+        folder.subcategories.append(subfolder)
+        level.categories.append(folder)
+    for index in range(materials):
+        material = ForgeMat()
+        material.name = rng.getrandbits(32)
+        material.grime = rng.getrandbits(32)
+        material.scratch_amount = _float(rng, 1 / 64)
+        material.grime_amount = _float(rng, 1 / 64)
+        for _ in range(1 + index % 4):
+            layer = ForgeLayer()
+            layer.swatch = rng.getrandbits(32)
+            layer.color = rng.getrandbits(32)
+            layer.color_intensity = _float(rng, 1 / 64)
+            layer.color_spread = _float(rng, 1 / 64)
+            layer.roughness = _float(rng, 1 / 64)
+            layer.force_metallic = rng.random() < 0.5
+            layer.force_off_metallic = rng.random() < 0.5
+            material.layers.append(layer)
+        level.materials.append(material)
+    modes = list(ForgeObjectMode)
+    for index in range(objects):
+        forge_object = ForgeObject()
+        forge_object.index = index
+        forge_object.global_id = rng.randint(-(2**31), 2**31 - 1)
+        forge_object.position = [_float(rng, 4) for _ in range(3)]
+        forge_object.rotation_up = [_float(rng, 1 / 64) for _ in range(3)]
+        forge_object.rotation_forward = [_float(rng, 1 / 64) for _ in range(3)]
+        forge_object.scale = [abs(_float(rng, 1 / 64)) + 1 for _ in range(3)]
+        forge_object.mode = rng.choice(modes)
+        forge_object.variant = rng.randint(-(2**31), 2**31 - 1)
+        forge_object.variant_index = rng.randint(0, 8)
+        forge_object.material_id = rng.randrange(materials) if materials else 0
+        level.objects.append(forge_object)
+
+        folder = level.categories[index % folders]
+        entry = ForgeFolderEntry()
+        entry.name = f"Object {index}"
+        entry.index = index
+        if index // folders % 2:
+            entry.parent = folder.subcategories[0].id
+            folder.subcategories[0].objects.append(entry)
+        else:
+            entry.parent = folder.id
+            folder.objects.append(entry)
+    return level
+
+
+def _padding(rng: random.Random) -> list[BondValue]:
+    # Fields that forge maps carry but read_forge_map does not use
+    return [
+        BondValue(1, BondType.Uint64, rng.getrandbits(64)),
+        BondValue(
+            9,
+            BondType.Struct,
+            [
+                BondValue(0, BondType.Wstring, "Synthetic object"),
+                BondValue(1, BondType.List, [BondValue(0, BondType.Double, 0.5)] * 4),
+                BondValue(2, BondType.Bool, True),
+            ],
+        ),
+    ]
+
+
+def generate_forge_map(
+    objects: int, folders: int = 16, materials: int = 8, seed: int = 0
+) -> tuple[ForgeLevel, bytes]:
+    """
+    Generates a level and encodes it as a forge map file, adding unused fields to every object
+    so the file resembles a real map.
+
+    Args:
+    - objects: Number of objects.
+    - folders: Number of top level folders, at least one.
+    - materials: Number of materials.
+    - seed: Seed of the random values.
+
+    Returns:
+    - Generated level and the contents of its map file.
+    """
+    level = generate_forge_level(objects, folders, materials, seed)
+    rng = random.Random(seed)
+    base = get_level_struct(level)
+    object_list = base.get_by_id(3)
+    if object_list:
+        for forge_object in object_list.get_elements():
+            forge_object.get_elements().extend(_padding(rng))
+    return level, write_base_struct(base)
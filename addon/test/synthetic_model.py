@@ -0,0 +1,121 @@
+import struct
+
+import numpy as np
+import numpy.typing as npt
+
+from ..src.model.vertex_type import VertexType
+
+# Vertex buffers of a section, in the order they are stored in
+VERTEX_BUFFERS: tuple[str, ...] = (
+    "position",
+    "uv0",
+    "uv1",
+    "uv2",
+    "normal",
+    "color",
+    "blend_indices",
+    "blend_weights",
+    "blend_weights_extra",
+    "blendshape_index",
+    "blendshape_position",
+)
+
+
+def _buffer(stride: int, count: int, data: npt.NDArray[np.generic]) -> bytes:
+    return struct.pack("<bI", stride, count) + np.ascontiguousarray(data).tobytes()
+
+
+def section_buffers(
+    rng: np.random.Generator,
+    vertex_count: int,
+    triangle_count: int,
+    blend_index_stride: int = 4,
+    bone_count: int = 8,
+) -> dict[str, npt.NDArray[np.generic]]:
+    """
+    Generates random raw buffer contents for a section, as they are stored in the file.
+
+    Args:
+    - rng: Random generator.
+    - vertex_count: Number of vertices.
+    - triangle_count: Number of triangles, indexing the vertices.
+    - blend_index_stride: 4 for byte bone indices, 8 for 16-bit ones.
+    - bone_count: Number of bones the blend indices refer to.
+
+    Returns:
+    - Raw arrays by buffer name, plus "indices".
+    """
+    index_dtype = np.uint8 if blend_index_stride == 4 else np.uint16
+    weights = rng.integers(0, 1024, (vertex_count, 3), dtype=np.uint32)
+    # Some vertices only have zero weights, or a single one
+    weights[::7] = 0
+    weights[1::5, 1:] = 0
+    blend_indices = rng.integers(0, bone_count, (vertex_count, 4)).astype(index_dtype)
+    # Some vertices list the same bone more than once
+    blend_indices[2::6, 1] = blend_indices[2::6, 0]
+    return {
+        "indices": rng.integers(0, vertex_count, triangle_count * 3).astype(np.uint16),
+        "position": rng.integers(0, 65536, (vertex_count, 4), dtype=np.uint16),
+        "uv0": rng.integers(0, 65536, (vertex_count, 2), dtype=np.uint16),
+        "uv1": rng.integers(0, 65536, (vertex_count, 2), dtype=np.uint16),
+        "uv2": rng.integers(0, 65536, (vertex_count, 2), dtype=np.uint16),
+        "normal": rng.integers(0, 2**32, vertex_count, dtype=np.uint32),
+        "color": rng.integers(0, 256, (vertex_count, 4), dtype=np.uint8),
+        "blend_indices": blend_indices,
+        "blend_weights": weights[:, 0] | weights[:, 1] << 10 | weights[:, 2] << 20,
+        "blend_weights_extra": rng.random(vertex_count, dtype=np.float32),
+        "blendshape_index": rng.integers(0, 4, vertex_count).astype(np.int32),
+        "blendshape_position": rng.integers(
+            0, [65536, 65536, 65536, 3], (vertex_count, 4), dtype=np.uint32
+        ).astype(np.uint16),
+    }
+
+
+def section_bytes(
+    buffers: dict[str, npt.NDArray[np.generic]],
+    vertex_type: VertexType = VertexType.Skinned,
+    region: int = 0,
+    permutation: int = 0,
+) -> bytes:
+    """
+    Encodes a section with one submesh over all of its indices. Only the vertex buffers present
+    in `buffers` are written and flagged.
+    """
+    indices = buffers["indices"]
+    data = struct.pack("<iiIBB?", region, permutation, 1, 0, vertex_type, False)
+    data += struct.pack("<iiHHhh", len(indices), 0, 0, 0, 0, 0)
+    data += struct.pack("<B", 3) + _buffer(indices.dtype.itemsize, len(indices), indices)
+    data += struct.pack("<11?", *(name in buffers for name in VERTEX_BUFFERS))
+    for name in VERTEX_BUFFERS:
+        if name not in buffers:
+            continue
+        array = buffers[name]
+        stride = array.dtype.itemsize * (array.shape[1] if array.ndim > 1 else 1)
+        data += _buffer(stride, len(array), array)
+    return data
+
+
+def model_bytes(
+    sections: list[bytes],
+    tag_id: int = 1,
+    bounds: tuple[tuple[float, float], ...] = ((-1.0, 1.0),) * 9,
+    materials: tuple[int, ...] = (10, 20),
+) -> bytes:
+    """
+    Encodes a model without regions, bones, markers or offsets.
+
+    Args:
+    - sections: Encoded sections, see `section_bytes`.
+    - tag_id: Tag ID of the model.
+    - bounds: (min, max) of the x, y, z, u, v, u1, v1, u2 and v2 compression bounds.
+    - materials: Material IDs of the model.
+
+    Returns:
+    - Contents of the model file.
+    """
+    data = b"SURA" + struct.pack(
+        "<i?7I", tag_id, False, 0, 0, 0, len(materials), len(sections), 1, 0
+    )
+    data += struct.pack("<18f", *(value for bound in bounds for value in bound))
+    data += struct.pack(f"<{len(materials)}i", *materials)
+    return data + b"".join(sections)
@@ -0,0 +1,123 @@
+import time
+import tracemalloc
+
+from collections.abc import Callable
+
+import pytest
+
+from ..src.madeleine.bond_writer import write_base_struct
+from ..src.madeleine.forge_level_reader import (
+    ForgeFolder,
+    ForgeLevel,
+    ForgeMat,
+    ForgeObject,
+    iter_forge_map,
+    read_forge_map,
+)
+from ..src.madeleine.forge_level_writer import get_level_struct
+from .synthetic_map import generate_forge_level, generate_forge_map
+
+
+def dump_level(level: ForgeLevel) -> tuple[object, ...]:
+    objects = [
+        (
+            o.index,
+            o.global_id,
+            o.position,
+            o.rotation_up,
+            o.rotation_forward,
+            o.scale,
+            o.variant,
+            o.mode,
+            o.variant_index,
+            o.material_id,
+        )
+        for o in level.objects
+    ]
+    materials = [
+        (
+            m.name,
+            m.grime,
+            m.scratch_amount,
+            m.grime_amount,
+            [vars(layer) for layer in m.layers],
+        )
+        for m in level.materials
+    ]
+    return objects, materials, level.root_category
+
+
+def test_synthetic_map_round_trip() -> None:
+    level, data = generate_forge_map(500, folders=7, materials=5, seed=1)
+    read = read_forge_map(data)
+    assert dump_level(read) == dump_level(level)
+    assert [(f.id, f.name, len(f.objects)) for f in read.categories] == [
+        (f.id, f.name, len(f.objects)) for f in level.categories
+    ]
+    assert len(read.object_folders) == 500
+    for folder in level.categories:
+        for entry in folder.objects:
+            assert read.object_folders[entry.index] == (folder.id, entry.name)
+        for entry in folder.subcategories[0].objects:
+            assert read.object_folders[entry.index] == (entry.parent, entry.name)
+
+
+def test_iter_forge_map() -> None:
+    level = generate_forge_level(20, folders=3, materials=2, seed=2)
+    level.root_category = 1
+    base = get_level_struct(level)
+    object_list = base.get_by_id(3)
+    assert object_list
+    # Objects without a position are skipped, but still count towards the index of the others
+    skipped = {4, 11}
+    for index in skipped:
+        fields = object_list.get_elements()[index].get_elements()
+        fields[:] = [field for field in fields if field.id != 3]
+
+    read = ForgeLevel()
+    kinds: list[type] = []
+    for item in iter_forge_map(write_base_struct(base), read):
+        kinds.append(type(item))
+        if isinstance(item, ForgeObject):
+            # Folders are read ahead of the objects, even though they are stored after them
+            assert read.root_category == 1
+            assert len(read.object_folders) == 20
+            read.objects.append(item)
+
+    assert kinds == [ForgeFolder] * 3 + [ForgeMat] * 2 + [ForgeObject] * 18
+    assert [o.index for o in read.objects] == [i for i in range(20) if i not in skipped]
+    assert [o.global_id for o in read.objects] == [
+        o.global_id for o in level.objects if o.index not in skipped
+    ]
+    assert list(iter_forge_map(b"")) == []
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("objects", [1_000, 10_000, 100_000])
+def test_read_forge_map_benchmark(
+    objects: int, record_property: Callable[[str, object], None]
+) -> None:
+    generated, data = generate_forge_map(objects)
+
+    start = time.perf_counter()
+    level = read_forge_map(data)
+    elapsed = time.perf_counter() - start
+    assert dump_level(level) == dump_level(generated)
+    del level
+
+    # Traced separately, tracemalloc slows decoding down too much to time it
+    tracemalloc.start()
+    try:
+        _ = read_forge_map(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    record_property("objects_per_second", objects / elapsed)
+    record_property("mb_per_second", len(data) / 1e6 / elapsed)
+    record_property("peak_memory_mb", peak / 1e6)
+    print(
+        f"\n{objects} objects, {len(data) / 1e6:.1f} MB: {elapsed:.3f} s, "
+        + f"{objects / elapsed:.0f} objects/s, {len(data) / 1e6 / elapsed:.1f} MB/s, "
+        + f"{peak / 1e6:.1f} MB peak"
+    )
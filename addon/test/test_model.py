@@ -0,0 +1,191 @@
+import struct
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from ..src.exceptions import IncorrectStrideValue
+from ..src.model.index_buffer import IndexBuffer
+from ..src.model.metadata import Model
+from ..src.model.reader import ModelReader
+from ..src.model.vectors import (
+    ByteVector4,
+    NormalizedVector2,
+    NormalizedVector4,
+    NormalizedVector101010,
+    NormalizedVector1010102PackedAsUnorm,
+    ShortVector4,
+    WordVector3DNormalizedWith4Word,
+)
+from ..src.model.vertex_type import VertexType
+from .synthetic_model import model_bytes, section_buffers, section_bytes
+
+Vector = (
+    ByteVector4
+    | NormalizedVector2
+    | NormalizedVector4
+    | NormalizedVector101010
+    | NormalizedVector1010102PackedAsUnorm
+    | ShortVector4
+    | WordVector3DNormalizedWith4Word
+)
+
+
+def read_model(data: bytes) -> Model:
+    model = Model()
+    model.read(ModelReader(data))
+    return model
+
+
+def read_elements(vector: type[Vector], array: npt.NDArray[np.generic]) -> list[Vector]:
+    # The per-element path the buffers were decoded with before they were read as arrays
+    reader = ModelReader(np.ascontiguousarray(array).tobytes())
+    elements: list[Vector] = []
+    for _ in range(len(array)):
+        element = vector()
+        element.read(reader)
+        elements.append(element)
+    return elements
+
+
+def components(elements: list[Vector], names: str) -> npt.NDArray[np.float64]:
+    return np.array([[getattr(e, name) for name in names] for e in elements], dtype=np.float64)
+
+
+@pytest.mark.parametrize("blend_index_stride", [4, 8])
+def test_decode_matches_per_element_path(blend_index_stride: int) -> None:
+    rng = np.random.default_rng(blend_index_stride)
+    buffers = section_buffers(rng, 200, 150, blend_index_stride)
+    model = read_model(model_bytes([section_bytes(buffers)] * 2))
+    section = model.sections[1]
+    vertex_buffer = section.vertex_buffer
+
+    np.testing.assert_array_equal(section.index_buffer.indices, buffers["indices"])
+    np.testing.assert_allclose(
+        vertex_buffer.position_buffer.positions,
+        components(read_elements(NormalizedVector4, buffers["position"]), "xyzw"),
+        atol=1e-6,
+    )
+    for name, uv_buffer in (
+        ("uv0", vertex_buffer.uv0_buffer),
+        ("uv1", vertex_buffer.uv1_buffer),
+        ("uv2", vertex_buffer.uv2_buffer),
+    ):
+        np.testing.assert_allclose(
+            uv_buffer.uv,
+            components(read_elements(NormalizedVector2, buffers[name]), "xy"),
+            atol=1e-6,
+        )
+    np.testing.assert_allclose(
+        vertex_buffer.normal_buffer.normals,
+        components(read_elements(NormalizedVector1010102PackedAsUnorm, buffers["normal"]), "xyzw"),
+        atol=1e-6,
+    )
+    np.testing.assert_array_equal(vertex_buffer.color_buffer.color, buffers["color"])
+    index_vector = ByteVector4 if blend_index_stride == 4 else ShortVector4
+    np.testing.assert_array_equal(
+        vertex_buffer.weight_index_buffer.indices,
+        components(read_elements(index_vector, buffers["blend_indices"]), "xyzw"),
+    )
+    np.testing.assert_allclose(
+        vertex_buffer.weight_buffer.weights,
+        components(read_elements(NormalizedVector101010, buffers["blend_weights"]), "xyz"),
+        atol=1e-6,
+    )
+    np.testing.assert_array_equal(
+        vertex_buffer.weight_extra_buffer.values, buffers["blend_weights_extra"]
+    )
+    np.testing.assert_array_equal(
+        vertex_buffer.blendshape_index_buffer.indices, buffers["blendshape_index"]
+    )
+
+    shapes: dict[int, list[WordVector3DNormalizedWith4Word]] = {}
+    for element in read_elements(WordVector3DNormalizedWith4Word, buffers["blendshape_position"]):
+        assert isinstance(element, WordVector3DNormalizedWith4Word)
+        shapes.setdefault(element.index, []).append(element)
+    decoded = dict(vertex_buffer.blendshape_position_buffer.shapes())
+    assert sorted(decoded) == sorted(shapes)
+    for index, elements in shapes.items():
+        np.testing.assert_allclose(decoded[index], components(elements, "xyz"), atol=1e-6)
+
+
+def reference_blend_pairs(
+    buffers: dict[str, npt.NDArray[np.generic]], vertex_type: VertexType
+) -> dict[tuple[int, int], float]:
+    """
+    Skins the vertices one at a time like the importer used to, replacing the weight of a bone
+    that a vertex lists more than once.
+    """
+    indices = buffers["blend_indices"].tolist()
+    has_weights = "blend_weights" in buffers
+    weights = (
+        [e.to_tuple() for e in read_elements(NormalizedVector101010, buffers["blend_weights"])]
+        if has_weights
+        else []
+    )
+    rigid = len(weights) == 0
+    rigid_boned = vertex_type == VertexType.RigidBoned and not has_weights
+    implied = vertex_type != VertexType.Skinned8Weights and has_weights
+
+    groups: dict[tuple[int, int], float] = {}
+    for i in range(len(buffers["position"])):
+        if i >= len(indices):
+            continue
+        bones = [int(x) for x in indices[i]]
+        if rigid or rigid_boned:
+            vertex_weights = [1.0] * len(bones)
+        else:
+            if i >= len(weights):
+                continue
+            vertex_weights = list(weights[i])
+            if implied:
+                vertex_weights = [*vertex_weights, 1.0]
+            if 0 in vertex_weights:
+                pairs = [(b, w) for b, w in zip(bones, vertex_weights) if w > 0]
+                bones = [b for b, _ in pairs]
+                vertex_weights = [w for _, w in pairs]
+        total = sum(vertex_weights)
+        if total > 0:
+            vertex_weights = [w / total for w in vertex_weights]
+        for bone, weight in zip(bones, vertex_weights):
+            groups[(i, bone)] = weight
+    return groups
+
+
+@pytest.mark.parametrize(
+    ("vertex_type", "has_weights"),
+    [
+        (VertexType.Skinned, True),
+        (VertexType.DqSkinned, True),
+        (VertexType.Skinned8Weights, True),
+        (VertexType.RigidBoned, False),
+        (VertexType.Rigid, False),
+    ],
+)
+def test_blend_pairs(vertex_type: VertexType, has_weights: bool) -> None:
+    buffers = section_buffers(np.random.default_rng(int(vertex_type)), 300, 10)
+    if not has_weights:
+        del buffers["blend_weights"]
+    section = read_model(model_bytes([section_bytes(buffers, vertex_type)])).sections[0]
+    vertices, bones, weights = section.vertex_buffer.blend_pairs(vertex_type)
+
+    assert np.all(np.diff(vertices) >= 0)
+    assert np.all(weights > 0)
+    pairs = {(v, b): w for v, b, w in zip(vertices.tolist(), bones.tolist(), weights.tolist())}
+    assert len(pairs) == len(vertices)
+    expected = reference_blend_pairs(buffers, vertex_type)
+    assert pairs.keys() == expected.keys()
+    for key, weight in expected.items():
+        assert pairs[key] == pytest.approx(weight, abs=1e-6)
+
+
+def test_index_buffer_strides() -> None:
+    buffer = IndexBuffer()
+    buffer.read(ModelReader(struct.pack("<BbI", 3, 0, 0)))
+    assert len(buffer.indices) == 0
+
+    buffer.read(ModelReader(struct.pack("<BbI2I", 3, 4, 2, 7, 70000)))
+    assert buffer.indices.tolist() == [7, 70000]
+
+    with pytest.raises(IncorrectStrideValue):
+        buffer.read(ModelReader(struct.pack("<BbI3B", 3, 3, 1, 1, 2, 3)))
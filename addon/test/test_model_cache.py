@@ -0,0 +1,142 @@
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ..src.model.geometry import SectionGeometry
+from ..src.model.geometry_cache import GeometryCache, get_section_geometry
+from ..src.model.metadata import Model
+from ..src.model.model_cache import ModelCache
+from ..src.model.reader import ModelReader
+from .synthetic_model import model_bytes, section_buffers, section_bytes
+
+
+def write_model(path: Path, seed: int = 0, vertex_count: int = 100) -> Path:
+    rng = np.random.default_rng(seed)
+    sections = [section_bytes(section_buffers(rng, vertex_count, vertex_count)) for _ in range(2)]
+    _ = path.write_bytes(model_bytes(sections))
+    return path
+
+
+def read_model(path: Path) -> Model:
+    model = Model()
+    model.read(ModelReader.read_file(path))
+    return model
+
+
+def assert_same_geometry(a: SectionGeometry, b: SectionGeometry) -> None:
+    arrays = a.arrays()
+    assert arrays.keys() == b.arrays().keys()
+    for name, array in arrays.items():
+        np.testing.assert_array_equal(b.arrays()[name], array)
+
+
+def set_mtime_ns(path: Path, mtime_ns: int) -> None:
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_geometry_cache_round_trip(tmp_path: Path) -> None:
+    path = write_model(tmp_path / "model.ekur")
+    cache = GeometryCache(tmp_path / "cache")
+    geometry = get_section_geometry(read_model(path), path, 1, cache)
+    assert geometry
+    assert len(list(cache.folder.glob("*.ekgc"))) == 1
+
+    loaded = cache.load(path, 1)
+    assert loaded
+    assert_same_geometry(geometry, loaded)
+    assert cache.load(path, 0) is None
+
+    # A fresh model picks the geometry up from the cache
+    cached = get_section_geometry(read_model(path), path, 1, cache)
+    assert cached
+    assert_same_geometry(geometry, cached)
+
+    cache.clear()
+    assert list(cache.folder.glob("*.ekgc")) == []
+    assert cache.load(path, 1) is None
+
+
+def test_geometry_cache_staleness(tmp_path: Path) -> None:
+    path = write_model(tmp_path / "model.ekur")
+    cache = GeometryCache(tmp_path / "cache")
+    model = read_model(path)
+    cache.store(path, 0, SectionGeometry.from_section(model.sections[0], model.bounding_boxes[0]))
+    mtime_ns = path.stat().st_mtime_ns
+    assert cache.load(path, 0)
+
+    # Same contents under another path
+    copy = tmp_path / "copy.ekur"
+    _ = shutil.copy2(path, copy)
+    assert cache.load(copy, 0) is None
+
+    # Same size, other modification time
+    set_mtime_ns(path, mtime_ns + 1_000_000_000)
+    assert cache.load(path, 0) is None
+    set_mtime_ns(path, mtime_ns)
+    assert cache.load(path, 0)
+
+    # Same modification time, other size
+    with open(path, "ab") as f:
+        _ = f.write(b"\0")
+    set_mtime_ns(path, mtime_ns)
+    assert cache.load(path, 0) is None
+
+
+def test_model_cache_budget(tmp_path: Path) -> None:
+    paths = [write_model(tmp_path / f"model_{i}.ekur", i) for i in range(4)]
+    model_size = read_model(paths[0]).nbytes
+    cache = ModelCache(budget=model_size * 2)
+
+    models = [cache.get(path) for path in paths[:2]]
+    assert cache.get(paths[0]) is models[0]
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # Model 1 is the least recently used one
+    _ = cache.get(paths[2])
+    assert len(cache) == 2
+    assert cache.get(paths[0]) is models[0]
+    assert cache.get(paths[1]) is not models[1]
+    assert (cache.hits, cache.misses) == (2, 4)
+
+    # Hits never evict, even when the budget shrinks
+    cache.budget = model_size
+    _ = cache.get(paths[1])
+    assert len(cache) == 2
+
+    # A model larger than the budget is still kept while it is the latest one
+    cache.budget = 0
+    model = cache.get(paths[3])
+    assert len(cache) == 1
+    assert cache.get(paths[3]) is model
+
+
+def test_model_cache_reparses_changed_model(tmp_path: Path) -> None:
+    path = write_model(tmp_path / "model.ekur")
+    cache = ModelCache()
+    model = cache.get(path)
+
+    mtime_ns = path.stat().st_mtime_ns
+    _ = write_model(path, seed=1, vertex_count=50)
+    set_mtime_ns(path, mtime_ns + 1_000_000_000)
+    changed = cache.get(path)
+    assert changed is not model
+    assert changed.vertex_count != model.vertex_count
+    assert len(cache) == 1
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc/self/fd")
+def test_model_cache_releases_files(tmp_path: Path) -> None:
+    paths = [write_model(tmp_path / f"model_{i}.ekur", i, 10) for i in range(300)]
+    geometry_cache = GeometryCache(tmp_path / "cache")
+    cache = ModelCache()
+    open_files = len(os.listdir("/proc/self/fd"))
+
+    for path in paths:
+        model = cache.get(path)
+        assert get_section_geometry(model, path, 0, geometry_cache)
+        assert geometry_cache.load(path, 0)
+    assert len(cache) == len(paths)
+    assert len(os.listdir("/proc/self/fd")) == open_files